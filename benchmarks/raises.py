@@ -0,0 +1,86 @@
+"""Compares the built-in raises analysis with a hand written `visit_Raise` visitor.
+
+Run `python -m benchmarks.raises` to print the time of both on `HTTPConnection.getresponse`,
+with a cold and a warm `AnalysisContext`.
+"""
+
+import ast
+import time
+from http.client import HTTPConnection
+from typing import Any, Callable, List
+
+from deep_ast import AnalysisContext, DeepVisitor, RaisesAnalyzer
+
+
+class ParseExceptions(DeepVisitor):
+    """The visitor from the README."""
+
+    def __init__(self, **kwargs) -> None:
+        self.raw_exceptions: List[str] = []
+        self.found_exceptions: List[str] = []
+        super().__init__(**kwargs)
+
+    def _add_exception(self, name: str):
+        self.raw_exceptions.append(name)
+
+        if name not in self.found_exceptions:
+            self.found_exceptions.append(name)
+
+    def visit_Raise(self, node: ast.Raise) -> Any:
+        exception_obj = node.exc
+
+        if isinstance(exception_obj, (ast.Call, ast.Name)):
+            name = (
+                exception_obj.id
+                if isinstance(exception_obj, ast.Name)
+                else exception_obj.func.id  # type: ignore[attr-defined]
+            )
+
+            self._add_exception(name)
+            return self.generic_visit(node)
+
+        self._add_exception("EmptyRaise")
+        return self.generic_visit(node)
+
+
+def _visitor(context: AnalysisContext) -> List[str]:
+    parser = ParseExceptions(context=context)
+    parser.deep_visit(HTTPConnection.getresponse)
+    return parser.found_exceptions
+
+
+def _engine(context: AnalysisContext) -> List[str]:
+    found = RaisesAnalyzer(context).analyze(HTTPConnection.getresponse)
+    return [exception.name for exception in found]
+
+
+def _time(run: Callable[[AnalysisContext], List[str]], warm: bool, repeat: int):
+    best = float("inf")
+    found: List[str] = []
+
+    context = AnalysisContext()
+
+    for _ in range(repeat):
+        if not warm:
+            context = AnalysisContext()
+
+        start = time.perf_counter()
+        found = run(context)
+        best = min(best, time.perf_counter() - start)
+
+    return best, found
+
+
+def main(repeat: int = 5):
+    print("| analysis | context | seconds | exceptions |")
+    print("|---|---|---|---|")
+
+    for name, run in (("visitor", _visitor), ("engine", _engine)):
+        for warm in (False, True):
+            seconds, found = _time(run, warm, repeat)
+            context = "warm" if warm else "cold"
+            print(f"| {name} | {context} | {seconds:.4f} | {', '.join(found)} |")
+
+
+if __name__ == "__main__":
+    main()
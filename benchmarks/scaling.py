@@ -0,0 +1,181 @@
+"""Measures how the cost of `deep_visit` grows with the size and shape of the code it walks.
+
+Run `python -m benchmarks.scaling --param functions --values 10,20,40,80` to print a table
+of time, visited nodes, expansions and peak memory for each value of the parameter.
+"""
+
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic import Shape, generate
+from deep_ast import DeepVisitor
+
+_COLUMNS = ["seconds", "visited_nodes", "expansions", "peak_kib"]
+
+
+def measure(shape: Shape, repeat: int = 3) -> Dict[str, Any]:
+    """Deep visit the `entry()` of a package with the given shape, keeping the fastest of `repeat` runs."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        name = f"synthetic_{abs(hash(shape))}"
+        path = generate(shape, Path(directory), name)
+
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+        sys.modules[name] = module
+
+        try:
+            spec.loader.exec_module(module)  # type: ignore[union-attr]
+            return _measure_entry(module.entry, repeat)  # type: ignore[attr-defined]
+        finally:
+            del sys.modules[name]
+
+
+def _measure_entry(entry: Any, repeat: int) -> Dict[str, Any]:
+    best: Optional[Dict[str, Any]] = None
+
+    for _ in range(repeat):
+        visitor = DeepVisitor()
+
+        start = time.perf_counter()
+        visitor.deep_visit(entry)
+        seconds = time.perf_counter() - start
+
+        result = {
+            "seconds": seconds,
+            "visited_nodes": visitor.visited_nodes,
+            "expansions": len(visitor.calls),
+        }
+
+        if best is None or seconds < best["seconds"]:
+            best = result
+
+    best["peak_kib"] = _peak_kib(entry)  # type: ignore[index]
+
+    return best  # type: ignore[return-value]
+
+
+def _peak_kib(entry: Any) -> int:
+    # tracemalloc slows down every allocation, so memory is measured in its own run.
+    tracemalloc.start()
+
+    try:
+        DeepVisitor().deep_visit(entry)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak // 1024
+
+
+def sweep(
+    param: str, values: List[Any], base: Shape = Shape(), repeat: int = 3
+) -> List[Dict[str, Any]]:
+    """Measure `base` once for every value of `param`."""
+
+    rows = []
+
+    for value in values:
+        row = {param: value}
+        row.update(measure(base._replace(**{param: value}), repeat))
+        rows.append(row)
+
+    return rows
+
+
+def format_table(param: str, rows: List[Dict[str, Any]]) -> str:
+    """Format the rows of a sweep as a markdown table, with the growth relative to the first row."""
+
+    header = [param] + _COLUMNS + ["nodes_growth"]
+    lines = [
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+
+    first_nodes = rows[0]["visited_nodes"] or 1
+
+    for row in rows:
+        cells = [
+            str(row[param]),
+            f"{row['seconds']:.4f}",
+            str(row["visited_nodes"]),
+            str(row["expansions"]),
+            str(row["peak_kib"]),
+            f"{row['visited_nodes'] / first_nodes:.2f}x",
+        ]
+        lines.append("| " + " | ".join(cells) + " |")
+
+    return "\n".join(lines)
+
+
+def plot(param: str, rows: List[Dict[str, Any]], output: str):
+    """Plot every measured column against `param`, requires matplotlib."""
+
+    try:
+        import matplotlib  # type: ignore[import]
+
+        matplotlib.use("Agg")
+        from matplotlib import pyplot  # type: ignore[import]
+    except ImportError:
+        raise Exception("Plotting requires matplotlib to be installed")
+
+    figure, axes = pyplot.subplots(1, len(_COLUMNS), figsize=(4 * len(_COLUMNS), 3.5))
+
+    x = [row[param] for row in rows]
+
+    for axis, column in zip(axes, _COLUMNS):
+        axis.plot(x, [row[column] for row in rows], marker="o")
+        axis.set_xlabel(param)
+        axis.set_title(column)
+
+    figure.tight_layout()
+    figure.savefig(output)
+
+
+def _parse_value(param: str, value: str) -> Any:
+    return type(getattr(Shape(), param))(value)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--param", choices=Shape._fields, default="functions")
+    parser.add_argument("--values", default="10,20,40,80")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--plot", help="Also save a plot to this file.")
+
+    for field in Shape._fields:
+        parser.add_argument(
+            f"--{field.replace('_', '-')}",
+            dest=field,
+            type=type(getattr(Shape(), field)),
+            help=f"Fixed value for {field} (default: {getattr(Shape(), field)})",
+        )
+
+    args = parser.parse_args(argv)
+
+    base = Shape(
+        **{
+            field: getattr(args, field)
+            for field in Shape._fields
+            if getattr(args, field) is not None
+        }
+    )
+
+    values = [_parse_value(args.param, value) for value in args.values.split(",")]
+
+    rows = sweep(args.param, values, base, args.repeat)
+
+    print(format_table(args.param, rows))
+
+    if args.plot:
+        plot(args.param, rows, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Generates synthetic packages with a known shape for measuring how deep traversals scale."""
+
+import random
+from pathlib import Path
+from textwrap import indent
+from typing import List, NamedTuple
+
+
+class Shape(NamedTuple):
+    """The shape of a synthetic package.
+
+    Attributes:
+        functions (int): How many functions to generate, spread evenly over `depth` levels.
+        depth (int): How many levels deep the call chain from `entry()` goes.
+        fanout (int): How many functions of the next level each function calls.
+        class_depth (int): How many classes are in the inheritance chain.
+        super_density (float): The fraction of methods that call `super()`.
+        shared_helpers (int): How many helpers every function calls, the same helpers are reused by all functions.
+        seed (int): Seed for the choices above, the same shape always generates the same code.
+    """
+
+    functions: int = 20
+    depth: int = 4
+    fanout: int = 2
+    class_depth: int = 3
+    super_density: float = 0.5
+    shared_helpers: int = 1
+    seed: int = 0
+
+
+def _function(name: str, calls: List[str]) -> str:
+    body = [
+        "value = len(args)",
+        "if value > 100:",
+        f'    raise ValueError("{name}")',
+    ]
+    body.extend(f"{call}()" for call in calls)
+    body.append("return value")
+
+    return f"def {name}(*args):\n{indent(chr(10).join(body), '    ')}\n"
+
+
+def _functions(shape: Shape) -> str:
+    per_level = max(1, shape.functions // shape.depth)
+
+    levels = [
+        [f"func_{level}_{index}" for index in range(per_level)]
+        for level in range(shape.depth)
+    ]
+
+    helpers = [f"helper_{index}" for index in range(shape.shared_helpers)]
+
+    sources = [_function(helper, []) for helper in helpers]
+
+    for level, names in enumerate(levels):
+        next_level = levels[level + 1] if level + 1 < shape.depth else []
+
+        for index, name in enumerate(names):
+            callees = [
+                next_level[(index + offset) % len(next_level)]
+                for offset in range(min(shape.fanout, len(next_level)))
+            ]
+            sources.append(_function(name, helpers + callees))
+
+    sources.append(_function("entry", levels[0] + ["run_classes"]))
+
+    return "\n\n".join(sources)
+
+
+def _classes(shape: Shape) -> str:
+    chooser = random.Random(shape.seed)
+
+    sources = []
+
+    for depth in range(shape.class_depth):
+        base = f"Class{depth - 1}" if depth else "object"
+
+        body = ["self.step()"]
+
+        if depth and chooser.random() < shape.super_density:
+            body.append("super().run()")
+
+        methods = [
+            (
+                "def step(self):\n    return helper_0()"
+                if shape.shared_helpers
+                else "def step(self):\n    return None"
+            ),
+            f"def run(self):\n{indent(chr(10).join(body), '    ')}",
+        ]
+
+        sources.append(
+            f"class Class{depth}({base}):\n"
+            + indent("\n\n".join(methods), "    ")
+            + "\n"
+        )
+
+    last = f"Class{shape.class_depth - 1}" if shape.class_depth else None
+
+    run = (
+        f"def run_classes():\n    obj = {last}()\n    obj.run()\n"
+        if last
+        else "def run_classes():\n    return None\n"
+    )
+
+    sources.append(run)
+
+    return "\n\n".join(sources)
+
+
+def generate(shape: Shape, directory: Path, name: str) -> Path:
+    """Write a module named `name` with the given shape to `directory` and return its path.
+
+    The module has an `entry()` function that reaches every generated function and method.
+    """
+
+    path = Path(directory) / f"{name}.py"
+
+    path.write_text(f"{_functions(shape)}\n\n{_classes(shape)}")
+
+    return path
@@ -32,7 +32,7 @@ nox.options.sessions = (
     # "docs-build",
 )
 
-locations = "src", "tests", "noxfile.py"
+locations = "src", "tests", "benchmarks", "noxfile.py"
 
 
 @session(python=python_versions[1])
@@ -1,11 +1,55 @@
 import ast
 
+from ._cache import ParseCache
+from ._context import AnalysisContext
+from ._diagnostics import Diagnostic, Diagnostics
+from ._flat import FlatTree
+from ._fused import FusedVisitor
+from ._graph import CallGraph, build_call_graph
+from ._incremental import (
+    ResultStore,
+    StoredResult,
+    changed_between_revisions,
+    changed_between_trees,
+)
 from ._mixin import DeepMixin
+from ._raises import RaisedException, RaisesAnalyzer, find_raises
+from ._trace import CallTrace, TraceRecorder, record_trace
+from ._transformer import CopyOnWriteTransformer, TransformedSources
 
 
 class DeepVisitor(DeepMixin, ast.NodeVisitor):
     pass
 
 
-class DeepTransformer(DeepMixin, ast.NodeTransformer):
-    pass
+class DeepTransformer(DeepMixin, CopyOnWriteTransformer):
+    _flat_traversal = False
+
+    def _module_transformed(self, item, tree):
+        self.transformed_sources.add(item, tree)
+
+
+__all__ = [
+    "AnalysisContext",
+    "CallGraph",
+    "CallTrace",
+    "DeepMixin",
+    "DeepTransformer",
+    "DeepVisitor",
+    "Diagnostic",
+    "Diagnostics",
+    "FlatTree",
+    "FusedVisitor",
+    "ParseCache",
+    "RaisedException",
+    "RaisesAnalyzer",
+    "ResultStore",
+    "StoredResult",
+    "TraceRecorder",
+    "TransformedSources",
+    "build_call_graph",
+    "changed_between_revisions",
+    "changed_between_trees",
+    "find_raises",
+    "record_trace",
+]
@@ -0,0 +1,97 @@
+import ast
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from ._flat import FlatTree
+
+_T = TypeVar("_T")
+
+
+class ParseCache:
+    """Parsed AST trees keyed by the python object they were parsed from.
+
+    The cached trees are shared, so they must never be modified. `DeepVisitor` only reads
+    them and `DeepTransformer` copies any node it changes, so both can use the same cache.
+    The cache can be used from several threads, each source is only kept once.
+
+    Args:
+        compact (bool): Keep every tree as a `FlatTree`, which uses far less memory. Visitors walk
+            the flat trees directly and only build the `ast` nodes their `visit_*` methods need.
+    """
+
+    def __init__(self, compact: bool = False) -> None:
+        self.compact = compact
+        self._trees: Dict[Any, ast.Module] = {}
+        self._flat_trees: Dict[Any, FlatTree] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, item: Any, get_source: Callable[[Any], str]) -> ast.Module:
+        """Return the AST of `item`, calling `get_source` and parsing it only on a cache miss.
+
+        A compact cache builds a new tree from the `FlatTree` on every call.
+        """
+
+        if self.compact:
+            return self.flat(item, get_source).node()  # type: ignore[return-value]
+
+        return self._get(self._trees, item, lambda: ast.parse(get_source(item)))
+
+    def flat(self, item: Any, get_source: Callable[[Any], str]) -> FlatTree:
+        """Return the AST of `item` as a `FlatTree`."""
+
+        return self._get(
+            self._flat_trees,
+            item,
+            lambda: FlatTree.from_ast(ast.parse(get_source(item))),
+        )
+
+    def _get(self, trees: Dict[Any, _T], item: Any, parse: Callable[[], _T]) -> _T:
+        key = _cache_key(item)
+
+        tree = trees.get(key) if key is not None else None
+
+        if tree is not None:
+            with self._lock:
+                self.hits += 1
+            return tree
+
+        # Parsing happens outside of the lock so threads dont wait on each other.
+        # If two threads race on the same item they both parse and the first one wins.
+        tree = parse()
+
+        with self._lock:
+            self.misses += 1
+
+            if key is not None:
+                tree = trees.setdefault(key, tree)
+
+        return tree
+
+    def __contains__(self, item: Any) -> bool:
+        """Whether `item` was already parsed, so getting its tree is cheap."""
+
+        key = _cache_key(item)
+
+        return key in (self._flat_trees if self.compact else self._trees)
+
+    def clear(self):
+        with self._lock:
+            self._trees.clear()
+            self._flat_trees.clear()
+
+    def __len__(self) -> int:
+        return len(self._trees) + len(self._flat_trees)
+
+
+def _cache_key(item: Any) -> Optional[Any]:
+    # Bound methods of different instances share the same source.
+    key = getattr(item, "__func__", item)
+
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
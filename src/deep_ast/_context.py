@@ -0,0 +1,89 @@
+import ast
+import threading
+from inspect import getmembers
+from types import FunctionType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ._cache import ParseCache
+
+_MISSING = object()
+
+
+class AnalysisContext:
+    """Caches and indexes that can be shared by any number of `DeepVisitor` and `DeepTransformer` instances.
+
+    Everything stored here only depends on the code being analyzed, never on a single traversal,
+    so one warm context can be used by many visitors at once, including from several threads.
+    Each visitor keeps its own traversal state and must only be used by one thread at a time.
+
+    Args:
+        cache (Optional[ParseCache]): The parsed sources to share, a new cache is created if omitted.
+    """
+
+    def __init__(self, cache: Optional[ParseCache] = None) -> None:
+        self.parse_cache = cache if cache is not None else ParseCache()
+        self._lock = threading.RLock()
+        self._members: Dict[Any, List[Tuple[str, Any]]] = {}
+        self._class_defs: Dict[Any, Optional[ast.ClassDef]] = {}
+        self._defining_classes: Dict[FunctionType, Optional[type]] = {}
+
+    def members(self, module: Any) -> List[Tuple[str, Any]]:
+        """The result of `inspect.getmembers(module)`, computed once per module."""
+
+        members = self._members.get(module)
+
+        if members is not None:
+            return members
+
+        # getmembers is slow, dont hold the lock while other threads could be parsing.
+        members = getmembers(module)
+
+        with self._lock:
+            return self._members.setdefault(module, members)
+
+    def has_members(self, module: Any) -> bool:
+        return module in self._members
+
+    def class_def(
+        self, cls: Any, find: Callable[[Any], Optional[ast.ClassDef]]
+    ) -> Optional[ast.ClassDef]:
+        """The `ast.ClassDef` of `cls`, calling `find` only the first time a class is seen."""
+
+        class_def = self._class_defs.get(cls, _MISSING)
+
+        if class_def is not _MISSING:
+            return class_def  # type: ignore[return-value]
+
+        class_def = find(cls)
+
+        with self._lock:
+            return self._class_defs.setdefault(cls, class_def)
+
+    def has_class_def(self, cls: Any) -> bool:
+        return cls in self._class_defs
+
+    def defining_class(
+        self, func: Any, find: Callable[[Any], Optional[type]]
+    ) -> Optional[type]:
+        """The class a plain function was defined in, calling `find` only the first time."""
+
+        # Only plain functions always resolve to the same class.
+        if not isinstance(func, FunctionType):
+            return find(func)
+
+        parent = self._defining_classes.get(func, _MISSING)
+
+        if parent is not _MISSING:
+            return parent  # type: ignore[return-value]
+
+        parent = find(func)
+
+        with self._lock:
+            return self._defining_classes.setdefault(func, parent)
+
+    def clear(self):
+        with self._lock:
+            self.parse_cache.clear()
+            self._members.clear()
+            self._class_defs.clear()
+            self._defining_classes.clear()
@@ -0,0 +1,72 @@
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Why a call wasn't expanded.
+BUILTIN = "built-in"
+NO_SOURCE = "no source"
+NOT_FOUND = "not found"
+NO_PARENT_CLASSES = "no parent classes"
+PARENT_NOT_FOUND = "parent class not found"
+NOT_IN_PARENTS = "not defined by parent classes"
+NO_ATTRIBUTE = "not defined by the class"
+
+# (caller, line, column) of a call, the line is counted from the start of the caller's source like `CallTree.lines`.
+CallSite = Tuple[str, int, int]
+
+
+class Diagnostic(NamedTuple):
+    """A call that was skipped or couldn't be resolved, and how often that happened.
+
+    Attributes:
+        name (str): The name that was being resolved, like `foo` or `self.bar`.
+        reason (str): Why the call wasn't expanded, one of the reasons defined in this module.
+        call_site (CallSite): The caller, line and column of the call.
+        occurrences (int): How many times the call was skipped for this reason.
+    """
+
+    name: str
+    reason: str
+    call_site: CallSite
+    occurrences: int
+
+
+class Diagnostics:
+    """Collects the calls a traversal skipped or couldn't resolve, without printing anything.
+
+    Every distinct name, reason and call site is kept once with a count of how often it was
+    seen, so skipping the same built-in a thousand times costs a dictionary update each time.
+
+    Args:
+        sink (Optional[Callable[[Diagnostic], None]]): Called with the first occurrence of every
+            distinct record, like `print` or a logger method.
+    """
+
+    def __init__(self, sink: Optional[Callable[[Diagnostic], None]] = None) -> None:
+        self.sink = sink
+        self._counts: Dict[Tuple[str, str, CallSite], int] = {}
+
+    def add(self, name: str, reason: str, call_site: CallSite):
+        key = (name, reason, call_site)
+
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+
+        if count == 1 and self.sink is not None:
+            self.sink(Diagnostic(name, reason, call_site, count))
+
+    def records(self, reason: Optional[str] = None) -> List[Diagnostic]:
+        """Every record in the order they were first seen, only the ones for `reason` if given."""
+
+        return [
+            Diagnostic(name, record_reason, call_site, count)
+            for (name, record_reason, call_site), count in self._counts.items()
+            if reason is None or record_reason == reason
+        ]
+
+    def clear(self):
+        self._counts.clear()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __iter__(self) -> Iterator[Diagnostic]:
+        return iter(self.records())
@@ -0,0 +1,251 @@
+import ast
+import marshal
+from array import array
+from typing import Any, Dict, Iterator, List, Tuple, Type
+
+# Every concrete node class, sorted by name so the ids are stable for a python version.
+KINDS: List[Type[ast.AST]] = sorted(
+    (
+        node_class
+        for node_class in vars(ast).values()
+        if isinstance(node_class, type)
+        and issubclass(node_class, ast.AST)
+        and node_class._fields is not None
+    ),
+    key=lambda node_class: node_class.__name__,
+)
+
+_KIND_IDS: Dict[Type[ast.AST], int] = {
+    node_class: kind for kind, node_class in enumerate(KINDS)
+}
+
+# Deprecated classes like `Ellipsis` are still node kinds but aren't all in `vars(ast)` on every version.
+_KIND_NAMES: Dict[str, Type[ast.AST]] = {
+    node_class.__name__: node_class for node_class in KINDS
+}
+
+_POSITIONS = ("lineno", "col_offset", "end_lineno", "end_col_offset")
+
+# Every field value is one int, the low two bits say how to read the rest.
+_NONE = 0
+_NODE = 1
+_CONSTANT = 2
+_LIST = 3
+
+_MISSING = -1
+
+
+class FlatRoot(ast.AST):
+    """Stands in for the root of a `FlatTree` so it can be passed to `visit()`."""
+
+    _fields = ()
+
+    def __init__(self, tree: "FlatTree") -> None:
+        super().__init__()
+        self.tree = tree
+
+
+class FlatTree:
+    """An AST stored in a handful of flat arrays instead of one python object per node.
+
+    Nodes are numbered in the order `ast.NodeVisitor` would visit them, the root is node 0.
+    Identifiers and constants are interned, so each name is only stored once per tree.
+    Real `ast.AST` nodes are only built when `node()` is called.
+
+    Attributes:
+        kinds (array): The index into `KINDS` of every node.
+        fields (array): The encoded field values of every node, in `_fields` order.
+        field_offsets (array): Where the fields of each node start in `fields`.
+        lists (array): The encoded items of every list field.
+        list_offsets (array): Where each list starts in `lists`, the list ends where the next one starts.
+        positions (array): `lineno`, `col_offset`, `end_lineno` and `end_col_offset` of every node, -1 when missing.
+        constants (List[Any]): The interned identifiers and constant values.
+    """
+
+    def __init__(self) -> None:
+        self.kinds = array("H")
+        self.fields = array("i")
+        self.field_offsets = array("i")
+        self.lists = array("i")
+        self.list_offsets = array("i", [0])
+        self.positions = array("i")
+        self.constants: List[Any] = []
+        self._constant_ids: Dict[Tuple[type, Any], int] = {}
+
+    @classmethod
+    def from_ast(cls, root: ast.AST) -> "FlatTree":
+        tree = cls()
+        tree._add(root)
+        tree._constant_ids = {}
+        return tree
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def kind(self, index: int) -> Type[ast.AST]:
+        return KINDS[self.kinds[index]]
+
+    def children(self, index: int) -> Iterator[int]:
+        """The child nodes of `index`, in the order `ast.NodeVisitor.generic_visit` visits them."""
+
+        start = self.field_offsets[index]
+
+        for value in self.fields[start : start + len(self.kind(index)._fields)]:
+            tag = value & 3
+
+            if tag == _NODE:
+                yield value >> 2
+
+            elif tag == _LIST:
+                for item in self._list(value >> 2):
+                    if item & 3 == _NODE:
+                        yield item >> 2
+
+    def node(self, index: int = 0) -> ast.AST:
+        """Build the real `ast.AST` for node `index` and everything below it."""
+
+        node_class = self.kind(index)
+        start = self.field_offsets[index]
+
+        node = node_class(
+            **{
+                name: self._decode(value)
+                for name, value in zip(
+                    node_class._fields,
+                    self.fields[start : start + len(node_class._fields)],
+                )
+            }
+        )
+
+        position = index * len(_POSITIONS)
+
+        for name, value in zip(
+            _POSITIONS, self.positions[position : position + len(_POSITIONS)]
+        ):
+            if value != _MISSING:
+                setattr(node, name, value)
+
+        return node
+
+    def to_bytes(self) -> bytes:
+        return marshal.dumps(
+            (
+                [node_class.__name__ for node_class in KINDS],
+                self.kinds.tobytes(),
+                self.fields.tobytes(),
+                self.field_offsets.tobytes(),
+                self.lists.tobytes(),
+                self.list_offsets.tobytes(),
+                self.positions.tobytes(),
+                self.constants,
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FlatTree":
+        (
+            kind_names,
+            kinds,
+            fields,
+            field_offsets,
+            lists,
+            list_offsets,
+            positions,
+            constants,
+        ) = marshal.loads(data)
+
+        tree = cls()
+
+        # Kind ids are only stable for a single python version, so map them by name.
+        # Kinds that don't exist on this version only matter if the tree uses them.
+        stored_kinds = array("H")
+        stored_kinds.frombytes(kinds)
+        remap = {}
+
+        for kind in set(stored_kinds):
+            node_class = _KIND_NAMES.get(kind_names[kind])
+
+            if node_class is None:
+                raise Exception(
+                    f"Cannot load the tree, node kind {kind_names[kind]} doesn't exist in this python version"
+                )
+
+            remap[kind] = _KIND_IDS[node_class]
+
+        tree.kinds = array("H", (remap[kind] for kind in stored_kinds))
+
+        tree.fields.frombytes(fields)
+        tree.field_offsets.frombytes(field_offsets)
+        tree.lists.frombytes(lists)
+        tree.list_offsets = array("i")
+        tree.list_offsets.frombytes(list_offsets)
+        tree.positions.frombytes(positions)
+        tree.constants = constants
+
+        return tree
+
+    def _list(self, list_index: int) -> array:
+        return self.lists[
+            self.list_offsets[list_index] : self.list_offsets[list_index + 1]
+        ]
+
+    def _decode(self, value: int) -> Any:
+        tag = value & 3
+
+        if tag == _NONE:
+            return None
+
+        if tag == _NODE:
+            return self.node(value >> 2)
+
+        if tag == _CONSTANT:
+            return self.constants[value >> 2]
+
+        return [self._decode(item) for item in self._list(value >> 2)]
+
+    def _add(self, node: ast.AST) -> int:
+        index = len(self.kinds)
+
+        self.kinds.append(_KIND_IDS[node.__class__])
+        self.field_offsets.append(0)
+
+        for name in _POSITIONS:
+            value = getattr(node, name, None)
+            self.positions.append(_MISSING if value is None else value)
+
+        # Children are numbered before this node's fields are stored, so keep them aside.
+        values = [self._encode(getattr(node, name, None)) for name in node._fields]
+
+        self.field_offsets[index] = len(self.fields)
+        self.fields.extend(values)
+
+        return index
+
+    def _encode(self, value: Any) -> int:
+        if value is None:
+            return _NONE
+
+        if isinstance(value, ast.AST):
+            return self._add(value) << 2 | _NODE
+
+        if isinstance(value, list):
+            items = [self._encode(item) for item in value]
+            list_index = len(self.list_offsets) - 1
+            self.lists.extend(items)
+            self.list_offsets.append(len(self.lists))
+            return list_index << 2 | _LIST
+
+        return self._intern(value) << 2 | _CONSTANT
+
+    def _intern(self, value: Any) -> int:
+        # 1, 1.0 and True are equal but must stay different constants.
+        key = (type(value), value)
+
+        constant_id = self._constant_ids.get(key)
+
+        if constant_id is None:
+            constant_id = len(self.constants)
+            self._constant_ids[key] = constant_id
+            self.constants.append(value)
+
+        return constant_id
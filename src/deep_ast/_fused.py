@@ -0,0 +1,136 @@
+import ast
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from types import FunctionType, MethodType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from ._context import AnalysisContext
+from ._mixin import DeepMixin
+from ._trace import CallTrace
+
+_Method = Tuple[DeepMixin, Callable[[ast.AST], Any]]
+
+
+def _skip_children(node: ast.AST) -> None:
+    return None
+
+
+class FusedVisitor(DeepMixin, ast.NodeVisitor):
+    """Runs several deep visitors in a single deep traversal.
+
+    Sources are retrieved, parsed and calls are resolved once, and every node is passed to the
+    `visit_*` methods of each visitor in turn. Each visitor keeps its own results.
+
+    The fused traversal always walks every child node, so calling `generic_visit` from a
+    `visit_*` method does nothing and leaving it out doesn't skip the children. Overrides of
+    `visit` itself are not called. While the traversal runs every visitor sees the fused call
+    tree, so `call_path()` works as usual from a `visit_*` method. Afterwards each visitor gets
+    its own call tree back, and the call tree and counters are read from the fused visitor.
+    Unresolved calls are recorded in the diagnostics of the fused visitor and of every visitor.
+
+    Args:
+        visitors (Iterable[DeepMixin]): The visitors to run.
+        context (Optional[AnalysisContext]): A context to share with other analyses.
+        trace (Optional[CallTrace]): Recorded calls to resolve call sites with.
+    """
+
+    def __init__(
+        self,
+        visitors: Iterable[DeepMixin],
+        context: Optional[AnalysisContext] = None,
+        trace: Optional[CallTrace] = None,
+    ) -> None:
+        self.visitors = list(visitors)
+        self._dispatch: Dict[Type[ast.AST], List[_Method]] = {}
+        super().__init__(context=context, trace=trace)
+
+    def deep_visit(self, callable: Union[FunctionType, MethodType]):
+        with self._shared_traversal():
+            super().deep_visit(callable)
+
+    async def deep_visit_async(
+        self,
+        callable: Union[FunctionType, MethodType],
+        executor: Optional[Executor] = None,
+    ):
+        with self._shared_traversal():
+            await super().deep_visit_async(callable, executor)
+
+    @contextmanager
+    def _shared_traversal(self) -> Iterator[None]:
+        own_state = [
+            (visitor.calls, visitor.raw_nodes, visitor.node_calls, visitor.current_call)
+            for visitor in self.visitors
+        ]
+
+        for visitor in self.visitors:
+            visitor.generic_visit = _skip_children  # type: ignore[assignment]
+            visitor.calls = self.calls
+            visitor.raw_nodes = self.raw_nodes
+            visitor.node_calls = self.node_calls
+
+        try:
+            yield
+        finally:
+            for visitor, state in zip(self.visitors, own_state):
+                del visitor.generic_visit
+                (
+                    visitor.calls,
+                    visitor.raw_nodes,
+                    visitor.node_calls,
+                    visitor.current_call,
+                ) = state
+
+    def _diagnose(self, name: str, reason: str):
+        site = self._diagnostic_site()
+
+        collectors = {id(self.diagnostics): self.diagnostics}
+
+        for visitor in self.visitors:
+            collectors.setdefault(id(visitor.diagnostics), visitor.diagnostics)
+
+        for diagnostics in collectors.values():
+            diagnostics.add(name, reason, site)
+
+    def generic_visit(self, node: ast.AST):
+        for visitor, method in self._methods(node.__class__):
+            visitor.current_call = self.current_call
+            method(node)
+
+        super().generic_visit(node)
+
+    def _walks_flat(self) -> bool:
+        # generic_visit only dispatches to the visitors, and `_needs_node` builds every node they visit.
+        return (
+            self._flat_traversal
+            and type(self).visit is DeepMixin.visit
+            and type(self).generic_visit is FusedVisitor.generic_visit
+        )
+
+    def _needs_node(self, node_class: type) -> bool:
+        return super()._needs_node(node_class) or bool(self._methods(node_class))
+
+    def _methods(self, node_class: Type[ast.AST]) -> List[_Method]:
+        methods = self._dispatch.get(node_class)
+
+        if methods is None:
+            name = "visit_" + node_class.__name__
+            methods = [
+                (visitor, getattr(visitor, name))
+                for visitor in self.visitors
+                if hasattr(visitor, name)
+            ]
+            self._dispatch[node_class] = methods
+
+        return methods
@@ -0,0 +1,266 @@
+import ast
+from array import array
+from types import FunctionType, MethodType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from ._context import AnalysisContext
+from ._mixin import DeepMixin
+from ._provenance import ROOT
+
+
+class CallGraph:
+    """The calls between callables found by a deep traversal, stored as a CSR adjacency structure.
+
+    The callees of callable `i` are `indices[indptr[i]:indptr[i + 1]]`. Reachability is computed
+    for every entry point at once by treating a python int as a bitset with one bit per entry point.
+
+    Attributes:
+        names (List[str]): The name of every callable, indexed by callable id.
+        indptr (array): Offsets into `indices` for each callable.
+        indices (array): The callee ids of every callable.
+        entry_points (List[int]): The callable ids of the entry points, in the order they were given.
+        tags (List[str]): Every interned node tag, like `Raise` or `Raise ValueError`.
+        node_tags (List[int]): A bitset of the tags found in the source of each callable.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        edges: Iterable[Any],
+        entry_points: List[int],
+        tags: List[str],
+        node_tags: List[int],
+    ) -> None:
+        self.names = names
+        self.entry_points = entry_points
+        self.tags = tags
+        self.node_tags = node_tags
+
+        callees: List[Set[int]] = [set() for _ in names]
+
+        for caller, callee in edges:
+            callees[caller].add(callee)
+
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+
+        for targets in callees:
+            self.indices.extend(sorted(targets))
+            self.indptr.append(len(self.indices))
+
+        self._reach: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def callees(self, callable_id: int) -> array:
+        return self.indices[self.indptr[callable_id] : self.indptr[callable_id + 1]]
+
+    def ids(self, name: str) -> List[int]:
+        """Every callable id with the display name `name`, like `HTTPResponse.begin()`."""
+
+        return [callable_id for callable_id, n in enumerate(self.names) if n == name]
+
+    def reach(self) -> List[int]:
+        """For every callable, a bitset of the entry points that can reach it.
+
+        Bit `n` is set when `entry_points[n]` reaches the callable. All entry points are
+        propagated together in a single pass over the graph.
+        """
+
+        if self._reach is not None:
+            return self._reach
+
+        reach = [0] * len(self.names)
+
+        for bit, entry in enumerate(self.entry_points):
+            reach[entry] |= 1 << bit
+
+        pending = list(dict.fromkeys(self.entry_points))
+        queued = set(pending)
+
+        while pending:
+            caller = pending.pop()
+            queued.discard(caller)
+            mask = reach[caller]
+
+            for callee in self.callees(caller):
+                merged = reach[callee] | mask
+
+                if merged != reach[callee]:
+                    reach[callee] = merged
+
+                    if callee not in queued:
+                        queued.add(callee)
+                        pending.append(callee)
+
+        self._reach = reach
+
+        return reach
+
+    def reverse_reach(self, targets: Iterable[int]) -> Set[int]:
+        """Every callable that can reach at least one of `targets`, including the targets."""
+
+        callers: List[List[int]] = [[] for _ in self.names]
+
+        for caller in range(len(self.names)):
+            for callee in self.callees(caller):
+                callers[callee].append(caller)
+
+        found = set(targets)
+        pending = list(found)
+
+        while pending:
+            for caller in callers[pending.pop()]:
+                if caller not in found:
+                    found.add(caller)
+                    pending.append(caller)
+
+        return found
+
+    def entry_points_reaching(self, target: Union[int, str]) -> List[str]:
+        """The names of the entry points that can reach `target`, a callable id or name."""
+
+        reach = self.reach()
+
+        targets = self.ids(target) if isinstance(target, str) else [target]
+
+        mask = 0
+
+        for callable_id in targets:
+            mask |= reach[callable_id]
+
+        return self._entry_names(mask)
+
+    def entry_points_with(self, tag: str) -> List[str]:
+        """The names of the entry points that can reach a node with `tag`, like `Raise ValueError`."""
+
+        if tag not in self.tags:
+            return []
+
+        bit = 1 << self.tags.index(tag)
+        reach = self.reach()
+
+        mask = 0
+
+        for callable_id, tags in enumerate(self.node_tags):
+            if tags & bit:
+                mask |= reach[callable_id]
+
+        return self._entry_names(mask)
+
+    def _entry_names(self, mask: int) -> List[str]:
+        return [
+            self.names[entry]
+            for bit, entry in enumerate(self.entry_points)
+            if mask >> bit & 1
+        ]
+
+    def to_numpy(self):
+        """Return `(indptr, indices)` as numpy arrays, numpy must be installed."""
+
+        try:
+            import numpy  # type: ignore[import]
+        except ImportError:
+            raise Exception("CallGraph.to_numpy() requires numpy to be installed")
+
+        return numpy.asarray(self.indptr), numpy.asarray(self.indices)
+
+
+class _GraphBuilder(DeepMixin, ast.NodeVisitor):
+    """Expands each callable only once, no matter how many callers it has."""
+
+    def __init__(self, context: Optional[AnalysisContext] = None) -> None:
+        self.tags: Dict[str, int] = {}
+        self.node_tags: List[int] = []
+        self.expanded: Set[int] = set()
+        super().__init__(context=context)
+
+    def _count_node(self, node_class: type):
+        # Modules are counted before the expansion they start is known.
+        if self.current_call != ROOT and node_class is not ast.Module:
+            self._tag(node_class.__name__)
+
+        super()._count_node(node_class)
+
+    def visit_Raise(self, node: ast.Raise) -> Any:
+        self._tag(f"Raise {_raise_name(node)}")
+        return self.generic_visit(node)
+
+    def _tag(self, tag: str):
+        bit = self.tags.setdefault(tag, len(self.tags))
+
+        callable_id = self.calls.callables[self.current_call]
+
+        missing = callable_id + 1 - len(self.node_tags)
+
+        if missing > 0:
+            self.node_tags.extend([0] * missing)
+
+        self.node_tags[callable_id] |= 1 << bit
+
+    def _visit_expansion(self, node: ast.AST, visit_tree: Callable[[Any], Any]) -> Any:
+        _, call = self._tree_items.get(id(node), (None, None))
+
+        if call is not None:
+            callable_id = self.calls.callables[call]
+
+            # The edge was recorded by the call tree, its callees are already known.
+            if callable_id in self.expanded:
+                self._tree_items.pop(id(node))
+                return None
+
+            self.expanded.add(callable_id)
+
+        return super()._visit_expansion(node, visit_tree)
+
+
+def _raise_name(node: ast.Raise) -> str:
+    exc = node.exc
+
+    if isinstance(exc, ast.Call):
+        exc = exc.func
+
+    if isinstance(exc, ast.Name):
+        return exc.id
+
+    if isinstance(exc, ast.Attribute):
+        return exc.attr
+
+    return "EmptyRaise"
+
+
+def build_call_graph(
+    entry_points: Iterable[Union[FunctionType, MethodType]],
+    context: Optional[AnalysisContext] = None,
+) -> CallGraph:
+    """Deep visit every entry point and return the calls that were resolved as a `CallGraph`.
+
+    Unlike calling `deep_visit` once per entry point, each callable is expanded once for the
+    whole graph, so shared helpers are only parsed and walked a single time.
+
+    Args:
+        entry_points (Iterable[Union[FunctionType, MethodType]]): The callables to start from.
+        context (Optional[AnalysisContext]): A context to share with other analyses.
+    """
+
+    builder = _GraphBuilder(context)
+
+    entry_ids = []
+
+    for entry_point in entry_points:
+        first_call = len(builder.calls)
+        builder.deep_visit(entry_point)
+        entry_ids.append(builder.calls.callables[first_call])
+
+    calls = builder.calls
+
+    edges = (
+        (calls.callables[parent], callee)
+        for parent, callee in zip(calls.parents, calls.callables)
+        if parent != ROOT
+    )
+
+    node_tags = builder.node_tags + [0] * (len(calls.names) - len(builder.node_tags))
+
+    return CallGraph(list(calls.names), edges, entry_ids, list(builder.tags), node_tags)
@@ -0,0 +1,423 @@
+import ast
+import hashlib
+import inspect
+import json
+import subprocess
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from ._diagnostics import NO_ATTRIBUTE, NOT_FOUND
+from ._mixin import DeepMixin
+
+_VERSION = 3
+
+# Runs the analysis of one entry point, returns its result and the visitor that did the deep visit.
+Analyze = Callable[[Any], Tuple[Any, DeepMixin]]
+
+
+class StoredResult(NamedTuple):
+    """The result of one entry point and what it depended on.
+
+    Attributes:
+        result (Any): What the analysis returned, it must be JSON serializable to be saved.
+        callables (Dict[str, str]): The hash of the source of every callable that was expanded, by key.
+        unresolved (Dict[str, List[str]]): The calls that couldn't be resolved by the file they could
+            be defined in, like `helper` for the module of the entry point or `Class.method` for
+            the files of a class.
+        known (Dict[str, List[str]]): The functions and classes in the same files that already
+            matched one of those calls, by qualified name.
+    """
+
+    result: Any
+    callables: Dict[str, str]
+    unresolved: Dict[str, List[str]]
+    known: Dict[str, List[str]]
+
+
+class ResultStore:
+    """Keeps the result of an analysis per entry point, so unchanged entry points don't have to be analyzed again.
+
+    Callables are identified by a key like `pkg/module.py:Class.method`, with the file relative to `root`.
+    Each entry point remembers the source hash of every callable expanded while it was visited.
+    Only the bodies of functions and classes are tracked, changing module level code doesn't make
+    an entry point stale. Calls that couldn't be resolved are remembered too, so adding a function
+    with their name to the module of the entry point, or a missing method to a class, makes it stale.
+
+    Args:
+        root (Union[str, Path]): The directory the keys are relative to, usually the root of the repository.
+
+    Attributes:
+        results (Dict[str, StoredResult]): The stored result of every entry point, by key.
+        reanalyzed (List[str]): The entry points that were analyzed by the last `update()`.
+    """
+
+    def __init__(self, root: Any = ".") -> None:
+        self.root = Path(root).resolve()
+        self.results: Dict[str, StoredResult] = {}
+        self.reanalyzed: List[str] = []
+        self._hashes: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def load(cls, path: Any, root: Any = ".") -> "ResultStore":
+        """Load a store written by `save()`, an empty store is returned if `path` doesn't exist."""
+
+        store = cls(root)
+
+        path = Path(path)
+
+        if not path.exists():
+            return store
+
+        data = json.loads(path.read_text())
+
+        if data.get("version") != _VERSION:
+            return store
+
+        store.results = {
+            key: StoredResult(
+                entry["result"],
+                entry["callables"],
+                entry["unresolved"],
+                entry["known"],
+            )
+            for key, entry in data["results"].items()
+        }
+
+        return store
+
+    def save(self, path: Any):
+        results = {key: stored._asdict() for key, stored in self.results.items()}
+
+        Path(path).write_text(
+            json.dumps({"version": _VERSION, "results": results}, indent=1)
+        )
+
+    def update(
+        self,
+        entry_points: Iterable[Any],
+        analyze: Analyze,
+        changed: Optional[Set[str]] = None,
+    ) -> Dict[str, Any]:
+        """Return the result of every entry point, only calling `analyze` for the ones that are stale.
+
+        An entry point is stale when it has no stored result, when one of the callables it
+        expanded changed, or when a call it couldn't resolve could now be found.
+        Entry points that aren't passed in are kept as they are.
+
+        Args:
+            entry_points (Iterable[Any]): The functions and methods to analyze.
+            analyze (Analyze): Deep visits one entry point with a new visitor, and returns its result and the visitor.
+            changed (Optional[Set[str]]): The keys of the callables that changed, like the result of
+                `changed_between_revisions()`. If omitted, the stored source hashes are compared
+                with the current files under `root`.
+        """
+
+        self.reanalyzed = []
+        self._hashes = {}
+
+        results = {}
+
+        for entry_point in entry_points:
+            key = self.key(entry_point)
+
+            if key is None:
+                raise Exception(f"Could not find the source file of {entry_point}")
+
+            stored = self.results.get(key)
+
+            if stored is None or self._is_stale(stored, changed):
+                result, visitor = analyze(entry_point)
+                callables = self._expanded_callables(visitor)
+                stored = StoredResult(
+                    result, callables, *self._unresolved(visitor, callables)
+                )
+                self.results[key] = stored
+                self.reanalyzed.append(key)
+
+            results[key] = stored.result
+
+        return results
+
+    def key(self, item: Any) -> Optional[str]:
+        """The key of a function, method or class, `None` if its source file can't be found."""
+
+        item = getattr(item, "__func__", item)
+
+        path = self._path(item)
+        qualname = getattr(item, "__qualname__", None)
+
+        if path is None or qualname is None:
+            return None
+
+        return f"{path}:{qualname}"
+
+    def _path(self, item: Any) -> Optional[str]:
+        try:
+            filename = inspect.getsourcefile(item)
+        except TypeError:
+            return None
+
+        if filename is None:
+            return None
+
+        path = Path(filename).resolve()
+
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _is_stale(self, stored: StoredResult, changed: Optional[Set[str]]) -> bool:
+        if changed is not None:
+            return not changed.isdisjoint(stored.callables) or any(
+                self._resolves(stored, *key.rsplit(":", 1)) for key in changed
+            )
+
+        return any(
+            self._current_hash(key) != source_hash
+            for key, source_hash in stored.callables.items()
+        ) or any(
+            self._resolves(stored, path, qualname)
+            for path in stored.unresolved
+            for qualname in self._file_hashes(path)
+        )
+
+    def _resolves(self, stored: StoredResult, path: str, qualname: str) -> bool:
+        """If the function or class could resolve one of the calls that weren't found."""
+
+        names = stored.unresolved.get(path)
+
+        return (
+            names is not None
+            and _searched_for(qualname, names)
+            and qualname not in stored.known.get(path, [])
+        )
+
+    def _unresolved(
+        self, visitor: DeepMixin, callables: Dict[str, str]
+    ) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        module_path = self._path(visitor.module) if visitor.module is not None else None
+
+        unresolved: Dict[str, Set[str]] = {}
+
+        # Plain names are searched for in the module of the entry point.
+        for record in visitor.diagnostics.records(NOT_FOUND):
+            if module_path is not None:
+                unresolved.setdefault(module_path, set()).add(record.name)
+
+        # Methods missing from a class can be added where the methods that were expanded are defined.
+        for record in visitor.diagnostics.records(NO_ATTRIBUTE):
+            owner = record.name.rsplit(".", 1)[0]
+
+            paths = {
+                path
+                for path, qualname in (key.rsplit(":", 1) for key in callables)
+                if qualname == owner or qualname.startswith(owner + ".")
+            }
+
+            if not paths and module_path is not None:
+                paths.add(module_path)
+
+            for path in paths:
+                unresolved.setdefault(path, set()).add(record.name)
+
+        # Definitions that match but weren't found, like methods of the excluded class, aren't new.
+        known = {
+            path: sorted(
+                qualname
+                for qualname in self._file_hashes(path)
+                if _searched_for(qualname, names)
+            )
+            for path, names in unresolved.items()
+        }
+
+        return {path: sorted(names) for path, names in unresolved.items()}, known
+
+    def _expanded_callables(self, visitor: DeepMixin) -> Dict[str, str]:
+        callables = {}
+
+        for key in visitor.calls.keys():
+            # Bound methods are interned as (class, function).
+            item = key[1] if isinstance(key, tuple) else key
+
+            callable_key = self.key(item)
+
+            if callable_key is None:
+                continue
+
+            source_hash = self._current_hash(callable_key)
+
+            if source_hash is not None:
+                callables[callable_key] = source_hash
+
+        return callables
+
+    def _current_hash(self, key: str) -> Optional[str]:
+        path, qualname = key.rsplit(":", 1)
+
+        return self._file_hashes(path).get(qualname)
+
+    def _file_hashes(self, path: str) -> Dict[str, str]:
+        hashes = self._hashes.get(path)
+
+        if hashes is None:
+            try:
+                source = (self.root / path).read_text()
+            except OSError:
+                source = ""
+
+            hashes = source_hashes(source)
+            self._hashes[path] = hashes
+
+        return hashes
+
+
+def _searched_for(qualname: str, names: Iterable[str]) -> bool:
+    # Plain names are searched for in the members of a module and in the attributes of those members.
+    parts = qualname.split(".")
+    return qualname in names or (len(parts) <= 2 and parts[-1] in names)
+
+
+class _Hasher(ast.NodeVisitor):
+    def __init__(self) -> None:
+        self.hashes: Dict[str, str] = {}
+        self._hashers: Dict[str, Any] = {}
+        self._prefix: List[str] = []
+
+    def _add(self, node: ast.AST, name: str, local_scope: bool):
+        qualname = ".".join(self._prefix + [name])
+
+        # Branches, overloads and property setters define the same name more than once, hash them all.
+        hasher = self._hashers.setdefault(qualname, hashlib.sha1())
+        hasher.update(ast.dump(node).encode() + b"\n")
+        self.hashes[qualname] = hasher.hexdigest()
+
+        self._prefix.append(f"{name}.<locals>" if local_scope else name)
+        self.generic_visit(node)
+        self._prefix.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> Any:
+        self._add(node, node.name, True)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> Any:
+        self._add(node, node.name, True)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> Any:
+        self._add(node, node.name, False)
+
+
+def source_hashes(source: str) -> Dict[str, str]:
+    """The hash of every function and class in `source`, by qualified name.
+
+    The hashes are taken from the AST, so changes to comments, formatting or line numbers are ignored.
+    """
+
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return {}
+
+    hasher = _Hasher()
+    hasher.visit(tree)
+
+    return hasher.hashes
+
+
+def _changed_in_file(path: str, old_source: str, new_source: str) -> Set[str]:
+    if old_source == new_source:
+        return set()
+
+    old_hashes = source_hashes(old_source)
+    new_hashes = source_hashes(new_source)
+
+    return {
+        f"{path}:{qualname}"
+        for qualname in old_hashes.keys() | new_hashes.keys()
+        if old_hashes.get(qualname) != new_hashes.get(qualname)
+    }
+
+
+def changed_between_trees(old_root: Any, new_root: Any) -> Set[str]:
+    """The keys of the functions and classes that differ between two source trees.
+
+    Functions that were added or removed count as changed. The keys are relative to the tree roots.
+    """
+
+    old_root, new_root = Path(old_root), Path(new_root)
+
+    paths = {
+        path.relative_to(root).as_posix()
+        for root in (old_root, new_root)
+        for path in root.rglob("*.py")
+    }
+
+    changed: Set[str] = set()
+
+    for path in sorted(paths):
+        changed |= _changed_in_file(
+            path, _read(old_root / path), _read(new_root / path)
+        )
+
+    return changed
+
+
+def changed_between_revisions(
+    old: str, new: Optional[str] = None, repository: Any = "."
+) -> Set[str]:
+    """The keys of the functions and classes that differ between two git revisions.
+
+    Args:
+        old (str): The revision the stored results were computed at, like `HEAD~1`.
+        new (Optional[str]): The revision to compare with, the working tree if omitted.
+        repository (Union[str, Path]): A directory of the repository, keys are relative to it.
+    """
+
+    revisions = [old] if new is None else [old, new]
+
+    paths = _git(
+        repository, "diff", "--relative", "--name-only", *revisions, "--", "*.py"
+    ).splitlines()
+
+    changed: Set[str] = set()
+
+    for path in paths:
+        old_source = _git_source(repository, old, path)
+
+        new_source = (
+            _read(Path(repository) / path)
+            if new is None
+            else _git_source(repository, new, path)
+        )
+
+        changed |= _changed_in_file(path, old_source, new_source)
+
+    return changed
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text()
+    except OSError:
+        return ""
+
+
+def _git(repository: Any, *args: str) -> str:
+    process = subprocess.run(
+        ["git", "-C", str(repository), *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    if process.returncode != 0:
+        raise Exception(f"git {' '.join(args)} failed: {process.stderr.strip()}")
+
+    return process.stdout
+
+
+def _git_source(repository: Any, revision: str, path: str) -> str:
+    # The file doesn't exist at every revision when it was added or removed.
+    try:
+        return _git(repository, "show", f"{revision}:./{path}")
+    except Exception:
+        return ""
@@ -0,0 +1,218 @@
+import ast
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+_FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+Position = Tuple[int, int]
+
+
+class Binding(NamedTuple):
+    """A single assignment to a local name.
+
+    Attributes:
+        position (Position): The point after which the binding is in effect.
+        expr (Optional[ast.expr]): The expression describing the new value. `None` means the type is unknown.
+        annotation (bool): `True` when `expr` is a type annotation instead of a value.
+    """
+
+    position: Position
+    expr: Optional[ast.expr]
+    annotation: bool = False
+
+
+def node_position(node: ast.AST) -> Position:
+    return (getattr(node, "lineno", 0), getattr(node, "col_offset", 0))
+
+
+def _end_position(node: ast.AST) -> Position:
+    end_line = getattr(node, "end_lineno", None)
+
+    if end_line is None:
+        # Python 3.7 has no end positions, the start of the next line is close enough.
+        return (getattr(node, "lineno", 0) + 1, 0)
+
+    return (end_line, getattr(node, "end_col_offset", 0))
+
+
+class LocalTypes(ast.NodeVisitor):
+    """Records the bindings of every local name in a function, in source order.
+
+    Nested functions, lambdas and classes are their own scopes and are not entered.
+    """
+
+    def __init__(self, function: _FunctionNode) -> None:
+        self.bindings: Dict[str, List[Binding]] = {}
+
+        start = node_position(function)
+
+        for arg in _all_args(function.args):
+            if arg.annotation is not None:
+                self._bind(arg.arg, start, arg.annotation, annotation=True)
+
+        for statement in function.body:
+            self.visit(statement)
+
+    def lookup(self, name: str, position: Position) -> Optional[Binding]:
+        """Return the binding of `name` that is in effect at `position`, if any."""
+
+        found = None
+
+        for binding in self.bindings.get(name, []):
+            if binding.position > position:
+                break
+
+            found = binding
+
+        return found
+
+    def _bind(
+        self,
+        name: str,
+        position: Position,
+        expr: Optional[ast.expr],
+        annotation: bool = False,
+    ):
+        bindings = self.bindings.setdefault(name, [])
+        bindings.append(Binding(position, expr, annotation))
+        bindings.sort(key=lambda binding: binding.position)
+
+    def _bind_target(
+        self, target: ast.expr, position: Position, expr: Optional[ast.expr]
+    ):
+        if isinstance(target, ast.Name):
+            self._bind(target.id, position, expr)
+            return
+
+        # Unpacking, we dont know which value ends up where.
+        if isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self._bind_target(element, position, None)
+            return
+
+        if isinstance(target, ast.Starred):
+            self._bind_target(target.value, position, None)
+
+    def visit_Assign(self, node: ast.Assign):
+        self.generic_visit(node)
+
+        for target in node.targets:
+            self._bind_target(target, _end_position(node), node.value)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        self.generic_visit(node)
+
+        if isinstance(node.target, ast.Name):
+            self._bind(
+                node.target.id, _end_position(node), node.annotation, annotation=True
+            )
+
+    def visit_AugAssign(self, node: ast.AugAssign):
+        self.generic_visit(node)
+        self._bind_target(node.target, _end_position(node), None)
+
+    def visit_NamedExpr(self, node: ast.AST):
+        self.generic_visit(node)
+        self._bind_target(node.target, _end_position(node), node.value)  # type: ignore[attr-defined]
+
+    def visit_For(self, node: Union[ast.For, ast.AsyncFor]):
+        self._bind_target(node.target, node_position(node), None)
+        self.generic_visit(node)
+
+    visit_AsyncFor = visit_For
+
+    def visit_With(self, node: Union[ast.With, ast.AsyncWith]):
+        for item in node.items:
+            if item.optional_vars is not None:
+                self._bind_target(
+                    item.optional_vars, node_position(node), item.context_expr
+                )
+
+        self.generic_visit(node)
+
+    visit_AsyncWith = visit_With
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        if node.name and node.type is not None:
+            self._bind(node.name, node_position(node), node.type, annotation=True)
+
+        self.generic_visit(node)
+
+    def visit_Import(self, node: Union[ast.Import, ast.ImportFrom]):
+        for alias in node.names:
+            name = alias.asname or alias.name.split(".")[0]
+            self._bind(name, _end_position(node), None)
+
+    visit_ImportFrom = visit_Import
+
+    def visit_FunctionDef(self, node: Union[_FunctionNode, ast.ClassDef]):
+        self._bind(node.name, _end_position(node), None)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+
+    def visit_Lambda(self, node: ast.Lambda):
+        return
+
+
+def _all_args(args: ast.arguments) -> List[ast.arg]:
+    all_args = list(getattr(args, "posonlyargs", [])) + list(args.args)
+
+    if args.vararg is not None:
+        all_args.append(args.vararg)
+
+    all_args.extend(args.kwonlyargs)
+
+    if args.kwarg is not None:
+        all_args.append(args.kwarg)
+
+    return all_args
+
+
+def unwrap_annotation(expr: ast.expr) -> Optional[ast.expr]:
+    """Reduce an annotation to the expression naming a single class.
+
+    `Optional[Foo]`, `Foo | None` and the string `"Foo"` all become `Foo`. Anything
+    that can't be narrowed to one class (like `List[Foo]`) returns `None`.
+    """
+
+    if isinstance(expr, ast.Constant) and isinstance(expr.value, str):
+        try:
+            parsed = ast.parse(expr.value, mode="eval")
+        except SyntaxError:
+            return None
+
+        return unwrap_annotation(parsed.body)
+
+    if isinstance(expr, ast.Subscript):
+        name = (
+            expr.value.attr
+            if isinstance(expr.value, ast.Attribute)
+            else getattr(expr.value, "id", None)
+        )
+
+        if name != "Optional":
+            return None
+
+        inner = expr.slice
+        # Python < 3.9 wraps the subscript in an ast.Index node.
+        inner = getattr(inner, "value", inner)
+
+        return unwrap_annotation(inner)  # type: ignore[arg-type]
+
+    if isinstance(expr, ast.BinOp) and isinstance(expr.op, ast.BitOr):
+        if _is_none(expr.right):
+            return unwrap_annotation(expr.left)
+
+        if _is_none(expr.left):
+            return unwrap_annotation(expr.right)
+
+        return None
+
+    if isinstance(expr, (ast.Name, ast.Attribute)):
+        return expr
+
+    return None
+
+
+def _is_none(expr: ast.expr) -> bool:
+    return isinstance(expr, ast.Constant) and expr.value is None
@@ -1,27 +1,141 @@
 import ast
+import asyncio
+import builtins
 import functools
 import inspect
-from inspect import getmembers, getmodule, getsource, isbuiltin
+from array import array
+from collections import deque
+from concurrent.futures import Executor
+from inspect import getmodule, getsource, isbuiltin
 from textwrap import dedent
-from types import FunctionType, MethodDescriptorType, MethodType, MethodWrapperType
-from typing import TYPE_CHECKING, Any, List, Optional, Union
+from types import (
+    CodeType,
+    FunctionType,
+    MethodDescriptorType,
+    MethodType,
+    MethodWrapperType,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from ._cache import ParseCache
+from ._context import AnalysisContext
+from ._diagnostics import (
+    BUILTIN,
+    NO_ATTRIBUTE,
+    NO_PARENT_CLASSES,
+    NO_SOURCE,
+    NOT_FOUND,
+    NOT_IN_PARENTS,
+    PARENT_NOT_FOUND,
+    CallSite,
+    Diagnostics,
+)
+from ._flat import FlatRoot, FlatTree
+from ._infer import LocalTypes, node_position, unwrap_annotation
+from ._provenance import ROOT, CallTree
+from ._trace import CallTrace, source_origin
 
 if TYPE_CHECKING:
     _Base = ast.NodeVisitor
 else:
     _Base = object
 
+# How many assignments we are willing to follow when inferring the type of a variable.
+_MAX_INFERENCE_DEPTH = 8
+
+
+_FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+class _Expansion(NamedTuple):
+    item: Any
+    call: Optional[int]
+    caller: int
+    last_obj: Any
+
+
+class _Queued(ast.AST):
+    """Returned instead of a tree when the expansion was queued by `deep_visit_async`."""
+
+    _fields = ()
+
+
+class _Scope(NamedTuple):
+    get_node: Callable[[], _FunctionNode]
+    self_obj: Any
+    local_types: List[LocalTypes]
+
+    def lookup(self, name: str, position):
+        # The local types are only collected the first time they are needed.
+        if not self.local_types:
+            self.local_types.append(LocalTypes(self.get_node()))
+
+        return self.local_types[0].lookup(name, position)
+
 
 class DeepMixin(_Base):
-    def __init__(self) -> None:
+    # Whether trees from a compact ParseCache can be walked without building ast nodes.
+    _flat_traversal = True
+
+    # Whether a call can be expanded after its caller was visited, as done by deep_visit_async.
+    _queued_expansion = True
+
+    def __init__(
+        self,
+        context: Optional[AnalysisContext] = None,
+        cache: Optional[ParseCache] = None,
+        trace: Optional[CallTrace] = None,
+        diagnostics: Optional[Diagnostics] = None,
+    ) -> None:
+        self.context = context if context is not None else AnalysisContext(cache)
+        self.cache = self.context.parse_cache
+        self.trace = trace
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
         self.module = None
-        self.obj = None
+        self.obj: Optional[type] = None
         self.visited_nodes = 0
         self.raw_nodes: List[str] = []
-        self.parent_nodes: List[str] = []
+        self.calls = CallTree()
+        self.current_call = ROOT
+        self.node_calls = array("i")
         self.last_obj: Union[None, FunctionType, MethodType, object] = None
+        self.inferred_calls = 0
+        self.avoided_searches = 0
+        self.traced_calls = 0
+        self._scopes: List[_Scope] = []
+        self._namespaces: List[Dict[str, Any]] = []
+        self._expanded: List[Any] = []
+        self._origins: Dict[Any, Optional[Tuple[str, int, int]]] = {}
+        self._traced_edges: Set[Tuple[int, int]] = set()
+        self._tree_items: Dict[int, Tuple[Any, Optional[int]]] = {}
+        self._call_site: Optional[ast.Call] = None
+        self._node_classes: Dict[type, bool] = {}
+        self._queue: Optional[Deque[_Expansion]] = None
         super().__init__()
 
+    @property
+    def parent_nodes(self) -> List[str]:
+        """The name of every callable that was expanded, in the order they were expanded."""
+
+        return list(self.calls)
+
+    def call_path(self, call: Optional[int] = None) -> List[str]:
+        """The chain of callables through which the current node, or the expansion `call`, was reached."""
+
+        return self.calls.path_names(self.current_call if call is None else call)
+
     def deep_visit(self, callable: Union[FunctionType, MethodType]):
         """Visit all AST nodes of the passed in `callable`. This will include the AST of any [ast.Call](https://docs.python.org/3/library/ast.html#ast.Call) nodes that are encountered.
 
@@ -29,22 +143,139 @@ class DeepMixin(_Base):
             callable (Union[FunctionType, MethodType]): The function or method that will be "deep" visited.
         """
 
-        start_node = None
+        start_node = self._start(callable)
+
+        if not start_node:
+            raise Exception(f"Could not find AST node for {callable}")
+
+        self.visit(start_node)
+
+    async def deep_visit_async(
+        self,
+        callable: Union[FunctionType, MethodType],
+        executor: Optional[Executor] = None,
+    ):
+        """Like `deep_visit`, but gives control back to the event loop between expansions.
+
+        Calls are queued instead of being expanded as soon as they are found, and each queued
+        callable is visited on its own. Sources are read and parsed in `executor`, so the loop only
+        runs the visiting itself. The members of the module and the class definitions `super()`
+        calls are resolved with are looked up there too, before the callables that need them. Cancelling the task, for example with `asyncio.wait_for`, stops
+        the traversal at the next expansion.
+
+        The nodes are visited in a different order than by `deep_visit`, and a callable is not
+        expanded again when it is reached from itself.
+
+        Args:
+            callable (Union[FunctionType, MethodType]): The function or method that will be "deep" visited.
+            executor (Optional[Executor]): Where sources are parsed, the loop's default executor if omitted.
+        """
+
+        if not self._queued_expansion:
+            raise Exception(
+                f"{type(self).__name__} needs calls to be expanded inline, use deep_visit()"
+            )
+
+        loop = asyncio.get_running_loop()
+
+        queue: Deque[_Expansion] = deque()
+        self._queue = queue
+
+        try:
+            if self._start(callable) is None:
+                raise Exception(f"Could not find AST node for {callable}")
+
+            if self.module is not None and not self.context.has_members(self.module):
+                await loop.run_in_executor(executor, self.context.members, self.module)
+
+            start = queue[0]
+
+            while queue:
+                expansion = queue.popleft()
+
+                super_class = self._super_class(expansion)
+
+                if expansion.item in self.cache and super_class is None:
+                    tree = self._parse(expansion.item)
+                else:
+                    tree = await loop.run_in_executor(
+                        executor, self._prepare, expansion.item, super_class
+                    )
+
+                if tree is None and expansion is start:
+                    raise Exception(f"Could not find AST node for {callable}")
+
+                if tree is not None:
+                    self._visit_queued(expansion, tree)
+
+                await asyncio.sleep(0)
+        finally:
+            self._queue = None
+            self.current_call = ROOT
+
+    def _start(self, callable: Union[FunctionType, MethodType]) -> Optional[ast.AST]:
+        self.current_call = ROOT
+        self._call_site = None
 
         self.module = getmodule(callable)  # type: ignore
 
-        parent = get_class_that_defined_method(callable)
+        parent = self._defining_class(callable)
 
         if parent:
             self.obj = parent
             self.last_obj = parent
 
-        start_node = self._convert_to_ast_node(callable)
+        return self._convert_to_ast_node(callable)
 
-        if not start_node:
-            raise Exception(f"Could not find AST node for {callable}")
+    def _super_class(self, expansion: _Expansion) -> Optional[type]:
+        """The class whose definition a `super()` call in the expansion needs, if it isn't known yet."""
 
-        self.visit(start_node)
+        cls = _class_of(expansion.last_obj)
+
+        if (
+            cls is None
+            or self.context.has_class_def(cls)
+            or not _uses_super(expansion.item)
+        ):
+            return None
+
+        return cls
+
+    def _prepare(self, item: Any, super_class: Optional[type]) -> Optional[ast.AST]:
+        if super_class is not None:
+            try:
+                self._get_class_def(super_class)
+            except Exception:
+                # Raised again by the super() call itself, if it is reached.
+                pass
+
+        return self._parse(item)
+
+    def _visit_queued(self, expansion: _Expansion, tree: ast.AST):
+        self.current_call = expansion.caller
+        self.last_obj = expansion.last_obj
+        self._call_site = None
+        self._tree_items[id(tree)] = (expansion.item, expansion.call)
+
+        self.visit(tree)
+
+    def _queue_expansion(self, item: Any, call: Optional[int]) -> ast.AST:
+        if call is None or not self._is_recursive(call):
+            self._queue.append(_Expansion(item, call, self.current_call, self.last_obj))  # type: ignore[union-attr]
+
+        return _Queued()
+
+    def _is_recursive(self, call: int) -> bool:
+        callable_id = self.calls.callables[call]
+        parent = self.calls.parents[call]
+
+        while parent != ROOT:
+            if self.calls.callables[parent] == callable_id:
+                return True
+
+            parent = self.calls.parents[parent]
+
+        return False
 
     def _convert_to_ast_node(
         self,
@@ -60,41 +291,66 @@ class DeepMixin(_Base):
             # print(f"Unable to process method desciption: {item.__name__}")
             return None
 
-        if record_node:
-            self._record_node(item)
+        call = self._record_node(item) if record_node else None
 
+        if record_node and self._queue is not None:
+            return self._queue_expansion(item, call)
+
+        tree = self._parse(item, record_node)
+
+        if tree is not None and record_node:
+            self._tree_items[id(tree)] = (item, call)
+
+        return tree
+
+    def _parse(self, item: Any, flat: bool = True) -> Optional[ast.AST]:
         try:
-            source = self._get_source(item)
-        except TypeError:
+            if flat and self.cache.compact and self._walks_flat():
+                return FlatRoot(self.cache.flat(item, self._get_source))
+
+            return self.cache.parse(item, self._get_source)
+        except (OSError, TypeError):
             # print(f"Invalid type {type(item)} for {item.__name__}")
             return None
 
-        return ast.parse(source)
-
-    def _record_node(self, item: Union[FunctionType, MethodType]):
+    def _record_node(self, item: Union[FunctionType, MethodType]) -> Optional[int]:
 
         if isinstance(item, MethodType):
             self.last_obj = item.__self__
-            self.parent_nodes.append(
-                f"{item.__self__.__class__.__name__}.{item.__name__}()"
+            owner = item.__self__.__class__
+            return self._add_call(
+                (owner, item.__func__), lambda: f"{owner.__name__}.{item.__name__}()"
             )
-            return
 
         if isinstance(item, FunctionType):
 
-            parent_class = get_class_that_defined_method(item)
+            parent_class = self._defining_class(item)
 
             if parent_class:
                 self.last_obj = parent_class
-                self.parent_nodes.append(f"{parent_class.__name__}.{item.__name__}()")
-                return
+                return self._add_call(
+                    item, lambda: f"{parent_class.__name__}.{item.__name__}()"
+                )
 
-            self.parent_nodes.append(f"{item.__name__}()")
-            return
+            return self._add_call(item, lambda: f"{item.__name__}()")
 
         if isinstance(item, type):
-            self.parent_nodes.append(f"{item.__name__}.init()")
-            return
+            self.last_obj = item
+            return self._add_call(item, lambda: f"{item.__name__}.init()")
+
+        return None
+
+    def _add_call(self, key: Any, name: Callable[[], str]) -> int:
+        callable_id = self.calls.intern(key, name)
+
+        site = self._call_site
+
+        if site is None:
+            return self.calls.add(self.current_call, callable_id)
+
+        return self.calls.add(
+            self.current_call, callable_id, site.lineno, site.col_offset
+        )
 
     def _get_source(self, item: Any):
         return dedent(getsource(item))
@@ -106,7 +362,7 @@ class DeepMixin(_Base):
         if excludes is None:
             excludes = []
 
-        for name, object in getmembers(self.module):
+        for name, object in self.context.members(self.module):
 
             if object in excludes:
                 continue
@@ -116,7 +372,7 @@ class DeepMixin(_Base):
                 # For some reason built-in exceptions
                 # get pass this check.
                 if isbuiltin(object):
-                    print(f"Skipping built-in {name}")
+                    self._diagnose(name, BUILTIN)
                     return None
 
                 return object
@@ -126,11 +382,14 @@ class DeepMixin(_Base):
             if attr is not None:
 
                 if isbuiltin(attr):
-                    print(f"Skipping built-in {name}")
+                    self._diagnose(f"{name}.{item}", BUILTIN)
                     return None
 
                 return attr
 
+        self._diagnose(item, NOT_FOUND)
+        return None
+
     def _find_ast_node(self, item: str):
 
         item_object = self._module_search(item, [self.last_obj])
@@ -138,13 +397,41 @@ class DeepMixin(_Base):
         if item_object is None:
             return item_object
 
-        return self._convert_to_ast_node(item_object)
+        item_node = self._convert_to_ast_node(item_object)
+
+        if item_node is None:
+            self._diagnose(item, NO_SOURCE)
+
+        return item_node
+
+    def _diagnose(self, name: str, reason: str):
+        """Record a call that wasn't expanded, at the call site being processed."""
+
+        self.diagnostics.add(name, reason, self._diagnostic_site())
+
+    def _diagnostic_site(self) -> CallSite:
+        caller = (
+            self.calls.names[self.calls.callables[self.current_call]]
+            if self.current_call != ROOT
+            else ""
+        )
+
+        site = self._call_site
+
+        if site is None:
+            return (caller, 0, 0)
+
+        return (caller, site.lineno, site.col_offset)
 
     def visit(self, node: ast.AST) -> Any:
 
-        self.visited_nodes += 1
+        if isinstance(node, FlatRoot):
+            return self._visit_expansion(node, self._visit_flat_root)
+
+        if isinstance(node, _Queued):
+            return None
 
-        self.raw_nodes.append(node.__class__.__name__)
+        self._count_node(node.__class__)
 
         if isinstance(node, ast.Call):
             self._proccess_call(node)
@@ -152,8 +439,207 @@ class DeepMixin(_Base):
         # if isinstance(node, ast.ClassDef):
         #     self._process_class_def(node)
 
+        if isinstance(node, ast.Module):
+            return self._visit_expansion(node, super().visit)
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return self._visit_function(node)
+
         return super().visit(node)
 
+    def _count_node(self, node_class: type):
+        self.visited_nodes += 1
+        self.raw_nodes.append(node_class.__name__)
+        self.node_calls.append(self.current_call)
+
+    def _visit_expansion(self, node: ast.AST, visit_tree: Callable[[Any], Any]) -> Any:
+        item, call = self._tree_items.pop(id(node), (None, None))
+
+        if item is None:
+            return visit_tree(node)
+
+        caller = self.current_call
+
+        if call is not None:
+            self.current_call = call
+
+            if isinstance(node, ast.Module):
+                # The module node was counted before we knew which expansion it started.
+                self.node_calls[-1] = call
+
+        self._namespaces.append(_namespace_of(item))
+        self._expanded.append(item)
+
+        try:
+            result = visit_tree(node)
+        finally:
+            self._namespaces.pop()
+            self._expanded.pop()
+            self.current_call = caller
+
+        if result is not None and result is not node:
+            self._module_transformed(item, result)
+
+        return result
+
+    def _module_transformed(self, item: Any, tree: ast.AST):
+        """Called when a transformer returns a new tree for the source of `item`."""
+
+        pass
+
+    def _visit_function(self, node: _FunctionNode) -> Any:
+        self._scopes.append(_Scope(lambda: node, self.last_obj, []))
+
+        try:
+            return super().visit(node)
+        finally:
+            self._scopes.pop()
+
+    def _visit_flat_root(self, root: FlatRoot):
+        self._visit_flat(root.tree, 0)
+
+    def _visit_flat(self, tree: FlatTree, index: int):
+        """Walk a `FlatTree`, only building ast nodes for calls and nodes with a `visit_*` method."""
+
+        node_class = tree.kind(index)
+
+        if self._needs_node(node_class):
+            self.visit(tree.node(index))
+            return
+
+        self._count_node(node_class)
+
+        if node_class is not ast.FunctionDef and node_class is not ast.AsyncFunctionDef:
+            for child in tree.children(index):
+                self._visit_flat(tree, child)
+            return
+
+        self._scopes.append(_Scope(lambda: tree.node(index), self.last_obj, []))  # type: ignore[arg-type, return-value]
+
+        try:
+            for child in tree.children(index):
+                self._visit_flat(tree, child)
+        finally:
+            self._scopes.pop()
+
+    def _walks_flat(self) -> bool:
+        """If trees from a compact ParseCache can be walked without building every ast node.
+
+        A visitor that overrides `visit` or `generic_visit` expects to see every node, so it
+        is always given complete trees.
+        """
+
+        return (
+            self._flat_traversal
+            and type(self).visit is DeepMixin.visit
+            and type(self).generic_visit is ast.NodeVisitor.generic_visit
+        )
+
+    def _needs_node(self, node_class: type) -> bool:
+        needed = self._node_classes.get(node_class)
+
+        if needed is None:
+            needed = node_class is ast.Call or hasattr(
+                self, "visit_" + node_class.__name__
+            )
+            self._node_classes[node_class] = needed
+
+        return needed
+
+    def _current_namespace(self) -> Dict[str, Any]:
+        if self._namespaces:
+            return self._namespaces[-1]
+
+        return vars(self.module) if self.module is not None else {}
+
+    def _current_self(self) -> Any:
+        if self._scopes:
+            return self._scopes[-1].self_obj
+
+        return self.last_obj
+
+    def _infer_type(self, expr: ast.expr, position, depth: int = 0) -> Optional[type]:
+        """Infer the class of the value produced by `expr`, using the bindings of the current function."""
+
+        if depth > _MAX_INFERENCE_DEPTH:
+            return None
+
+        if isinstance(expr, ast.Name):
+
+            if expr.id == "self":
+                return _class_of(self._current_self())
+
+            binding = (
+                self._scopes[-1].lookup(expr.id, position) if self._scopes else None
+            )
+
+            if binding is None or binding.expr is None:
+                return None
+
+            if binding.annotation:
+                return self._resolve_class(binding.expr, depth + 1)
+
+            # The value is computed before the name is bound, like `obj = obj.clone()`.
+            return self._infer_type(
+                binding.expr, node_position(binding.expr), depth + 1
+            )
+
+        if isinstance(expr, ast.Call):
+            func_obj = self._resolve_value(expr.func, position, depth + 1)
+
+            if isinstance(func_obj, type):
+                return func_obj
+
+            return _return_class(func_obj)
+
+        return None
+
+    def _resolve_value(self, expr: ast.expr, position, depth: int) -> Any:
+        """Statically evaluate `expr` when it names a global or an attribute of an inferred type."""
+
+        if isinstance(expr, ast.Name):
+
+            if (
+                expr.id != "self"
+                and self._scopes
+                and self._scopes[-1].lookup(expr.id, position) is not None
+            ):
+                return None
+
+            return self._lookup_global(expr.id) if expr.id != "self" else None
+
+        if isinstance(expr, ast.Attribute):
+
+            if isinstance(expr.value, ast.Name):
+                owner = self._infer_type(expr.value, position, depth)
+
+                if owner is not None:
+                    return getattr(owner, expr.attr, None)
+
+            owner = self._resolve_value(expr.value, position, depth)
+
+            return getattr(owner, expr.attr, None) if owner is not None else None
+
+        return None
+
+    def _resolve_class(self, expr: ast.expr, depth: int = 0) -> Optional[type]:
+        class_expr = unwrap_annotation(expr)
+
+        if class_expr is None:
+            return None
+
+        class_obj = self._resolve_value(class_expr, (0, 0), depth)
+
+        return class_obj if isinstance(class_obj, type) else None
+
+    def _lookup_global(self, name: str) -> Any:
+        namespace = self._current_namespace()
+
+        if name in namespace:
+            return namespace[name]
+
+        return getattr(builtins, name, None)
+
     def _process_attr(self, node: ast.Attribute):
 
         obj_name: Optional[str] = None
@@ -167,6 +653,11 @@ class DeepMixin(_Base):
         if isinstance(node.value, ast.Name):
             obj_name = node.value.id
 
+            # like bar.bazz()
+            if obj_name != "self":
+                self._process_inferred_attr(node)
+                return
+
         # like super().speak()
         if isinstance(node.value, ast.Call):
 
@@ -187,38 +678,82 @@ class DeepMixin(_Base):
         # Self doesnt always mean the object we started with... We could be parsing a method on some other
         # class than which we started.
         if obj_name == "self":
-            method_obj = getattr(self.last_obj, method_name, None)
+            self._process_self_attr(method_name)
+
+    def _process_self_attr(self, method_name: str):
 
-            if method_obj is not None:
+        self_obj = self._current_self()
+        method_obj = getattr(self_obj, method_name, None)
 
-                method_node = self._convert_to_ast_node(method_obj)
+        if method_obj is not None:
 
-                if not method_node:
-                    print(f"Unable to find method object for {obj_name}.{method_obj}()")
-                    return
+            method_node = self._convert_to_ast_node(method_obj)
 
-                self.visit(method_node)
+            if not method_node:
+                self._diagnose(f"self.{method_name}", NO_SOURCE)
                 return
 
-            # Everthing below this line should not be in the "if" statement...
-            # but doing so makes the problem worse. The problem is with var.foo()
-            # how do you know what class "var" is so you can look up the method "foo".
-            # Right now I dont know but its something I'm going to work on...
+            self.visit(method_node)
+            return
+
+        # We know which class "self" is and it has no such method, so it must be
+        # a callable instance attribute. Searching the module would only find an
+        # unrelated method that happens to share the name.
+        if self_obj is not None:
+            self.avoided_searches += 1
+            owner = type(self_obj) if not isinstance(self_obj, type) else self_obj
+            self._diagnose(f"{owner.__qualname__}.{method_name}", NO_ATTRIBUTE)
+            return
 
-            # If method_object is None we should still search the module tree for
-            # everything but the current obj and start object, this is still a bad approach
-            # because there could still be duplicate objects with the same method todo list to fix
+        # If we dont know what self is we still search the module tree for
+        # everything but the current obj, this is still a bad approach
+        # because there could still be duplicate objects with the same method.
 
-            method_node = self._find_ast_node(method_name)
+        method_node = self._find_ast_node(method_name)
 
-            if not method_node:
-                # print(f"YOLO search unable to find {method_name} in {self.module}")
+        if not method_node:
+            return
+
+        self.visit(method_node)
+
+    def _process_inferred_attr(self, node: ast.Attribute):
+
+        position = node_position(node)
+
+        owner = self._infer_type(node.value, position)
+
+        # Calls on a class like Foo.create()
+        if owner is None:
+            owner = self._resolve_value(node.value, position, 0)
+
+            if not isinstance(owner, type):
                 return
 
-            self.visit(method_node)
+        method_obj = getattr(owner, node.attr, None)
+
+        if method_obj is None:
+            self._diagnose(f"{owner.__qualname__}.{node.attr}", NO_ATTRIBUTE)
+            return
+
+        # Only methods written in python have source we can parse.
+        if not isinstance(getattr(method_obj, "__func__", method_obj), FunctionType):
+            return
+
+        method_node = self._convert_to_ast_node(method_obj)  # type: ignore[arg-type]
+
+        if method_node is None:
             return
 
+        self.inferred_calls += 1
+        self.visit(method_node)
+
+    def _defining_class(self, item: Any) -> Optional[type]:
+        return self.context.defining_class(item, get_class_that_defined_method)
+
     def _get_class_def(self, item: object):
+        return self.context.class_def(item, self._find_class_def)
+
+    def _find_class_def(self, item: object):
         class_node = self._convert_to_ast_node(item, record_node=False)  # type: ignore
 
         if class_node is None:
@@ -233,7 +768,7 @@ class DeepMixin(_Base):
 
     def _process_super(self, method_name: str):
 
-        class_def = self._get_class_def(self.last_obj)
+        class_def = self._get_class_def(_class_of(self._current_self()))
 
         parent_class_names = []
 
@@ -245,11 +780,9 @@ class DeepMixin(_Base):
             parent_class_names.append(parent.id)
 
         if not parent_class_names:
-            print(f"Failed to find parent classes for {method_name}")
+            self._diagnose(f"super().{method_name}", NO_PARENT_CLASSES)
             return
 
-        # print(parent_class_names)
-
         parent_search_results = [
             self._module_search(class_name) for class_name in parent_class_names
         ]
@@ -259,7 +792,8 @@ class DeepMixin(_Base):
         ]
 
         if not parent_class_objs:
-            print(f"Failed to convert {parent_class_names} to {parent_class_objs}")
+            self._diagnose(f"super().{method_name}", PARENT_NOT_FOUND)
+            return
 
         attr_obj = None
 
@@ -270,13 +804,13 @@ class DeepMixin(_Base):
                 break
 
         if attr_obj is None:
-            print(f"Failed to find {method_name} in {parent_class_objs}")
-            print(f"{parent_class_objs}")
+            self._diagnose(f"super().{method_name}", NOT_IN_PARENTS)
             return
 
         attr_node = self._convert_to_ast_node(attr_obj)
 
         if attr_node is None:
+            self._diagnose(f"super().{method_name}", NO_SOURCE)
             return
 
         self.visit(attr_node)
@@ -295,13 +829,17 @@ class DeepMixin(_Base):
         func_node = self._find_ast_node(func_name)
 
         if not func_node:
-            # print(f"Unable to find {func_name} in {self.module.__name__}")
             return
 
         self.visit(func_node)
 
     def _proccess_call(self, node: ast.Call):
 
+        self._call_site = node
+
+        if self.trace is not None and self._process_traced_call(node):
+            return
+
         if isinstance(node.func, ast.Attribute):
             self._process_attr(node.func)
             return
@@ -310,6 +848,137 @@ class DeepMixin(_Base):
             self._proccess_name(node.func)
             return
 
+    def _process_traced_call(self, node: ast.Call) -> bool:
+        """Expand the callables the trace saw `node` call, returns False if the trace never saw it run."""
+
+        origin = self._trace_origin()
+
+        if origin is None:
+            return False
+
+        filename, first_line, margin = origin
+
+        # Python 3.7 has no end positions, its traces only know lines.
+        end_line = getattr(node, "end_lineno", None) or node.lineno
+        end_column = getattr(node, "end_col_offset", None)
+
+        callees = self.trace.callees_at(  # type: ignore[union-attr]
+            filename,
+            first_line + node.lineno - 1,
+            first_line + end_line - 1,
+            end_column + margin if end_column is not None else -1,
+        )
+
+        if callees is None:
+            return False
+
+        for edge, callee in callees:
+
+            # Before python 3.11 every call on a line matches all of the line's edges.
+            if (self.current_call, edge) in self._traced_edges:
+                continue
+
+            callee_obj = self.trace.callable_at(callee)  # type: ignore[union-attr]
+
+            if callee_obj is None:
+                continue
+
+            self._traced_edges.add((self.current_call, edge))
+
+            self._call_site = node
+
+            callee_node = self._convert_to_ast_node(callee_obj)
+
+            if callee_node is None:
+                continue
+
+            self.traced_calls += 1
+            self.visit(callee_node)
+
+        return True
+
+    def _trace_origin(self) -> Optional[Tuple[str, int, int]]:
+        if not self._expanded:
+            return None
+
+        item = self._expanded[-1]
+        key = getattr(item, "__func__", item)
+
+        if key not in self._origins:
+            self._origins[key] = source_origin(key)
+
+        return self._origins[key]
+
+
+def _namespace_of(item: Any) -> Dict[str, Any]:
+    func = getattr(item, "__func__", item)
+    namespace = getattr(func, "__globals__", None)
+
+    if namespace is not None:
+        return namespace
+
+    module = getmodule(item)
+
+    return vars(module) if module is not None else {}
+
+
+def _uses_super(item: Any) -> bool:
+    """If the code of `item`, or of any method when it's a class, refers to `super`."""
+
+    values = vars(item).values() if isinstance(item, type) else [item]
+
+    codes = [
+        getattr(getattr(value, "__func__", value), "__code__", None) for value in values
+    ]
+
+    while codes:
+        code = codes.pop()
+
+        if not isinstance(code, CodeType):
+            continue
+
+        if "super" in code.co_names:
+            return True
+
+        codes.extend(const for const in code.co_consts if isinstance(const, CodeType))
+
+    return False
+
+
+def _class_of(obj: Any) -> Optional[type]:
+    if obj is None or isinstance(obj, type):
+        return obj
+
+    return type(obj)
+
+
+def _return_class(func: Any) -> Optional[type]:
+    """The class named by the return annotation of `func`, if it has one."""
+
+    func = getattr(func, "__func__", func)
+
+    annotations = getattr(func, "__annotations__", None)
+
+    if not isinstance(annotations, dict) or "return" not in annotations:
+        return None
+
+    annotation = annotations["return"]
+
+    if isinstance(annotation, type):
+        return annotation
+
+    if not isinstance(annotation, str):
+        return None
+
+    class_expr = unwrap_annotation(ast.Constant(value=annotation))
+
+    if not isinstance(class_expr, ast.Name):
+        return None
+
+    class_obj = getattr(func, "__globals__", {}).get(class_expr.id)
+
+    return class_obj if isinstance(class_obj, type) else None
+
 
 def _find_class_def(start_node: ast.AST):
     for node in ast.walk(start_node):
@@ -0,0 +1,96 @@
+from array import array
+from typing import Any, Callable, Dict, List, NamedTuple
+
+# The parent of the entry point of a traversal.
+ROOT = -1
+
+
+class CallTreeArrays(NamedTuple):
+    """A `CallTree` as flat arrays, the `i`th entry of each array describes the `i`th expansion.
+
+    Attributes:
+        parents (array): The expansion that made the call, or -1 for the entry point.
+        callables (array): The interned id of the callable that was expanded, an index into `names`.
+        lines (array): The line of the call site in the calling source, 0 for the entry point.
+        columns (array): The column of the call site in the calling source.
+        names (List[str]): The name of every interned callable.
+    """
+
+    parents: array
+    callables: array
+    lines: array
+    columns: array
+    names: List[str]
+
+
+class CallTree:
+    """Records every expansion of a deep traversal, and which expansion it was called from.
+
+    Each callable is interned once, so an expansion only costs a few integers no matter how
+    many times the same callable is reached.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self._ids: Dict[Any, int] = {}
+        self.parents = array("i")
+        self.callables = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+
+    def intern(self, key: Any, name: Callable[[], str]) -> int:
+        """Return the id of the callable identified by `key`, `name` is only called the first time it is seen."""
+
+        callable_id = self._ids.get(key)
+
+        if callable_id is None:
+            callable_id = len(self.names)
+            self._ids[key] = callable_id
+            self.names.append(name())
+
+        return callable_id
+
+    def keys(self) -> List[Any]:
+        """The key every callable was interned with, the index is the callable's id."""
+
+        return list(self._ids)
+
+    def add(self, parent: int, callable_id: int, line: int = 0, column: int = 0) -> int:
+        """Record an expansion of `callable_id` called from the expansion `parent` and return its index."""
+
+        self.parents.append(parent)
+        self.callables.append(callable_id)
+        self.lines.append(line)
+        self.columns.append(column)
+
+        return len(self.parents) - 1
+
+    def path(self, index: int) -> List[int]:
+        """The expansions leading to `index`, starting with the entry point."""
+
+        path = []
+
+        while index != ROOT:
+            path.append(index)
+            index = self.parents[index]
+
+        path.reverse()
+
+        return path
+
+    def path_names(self, index: int) -> List[str]:
+        """The names of the callables leading to `index`, starting with the entry point."""
+
+        return [self.names[self.callables[step]] for step in self.path(index)]
+
+    def to_arrays(self) -> CallTreeArrays:
+        return CallTreeArrays(
+            self.parents, self.callables, self.lines, self.columns, self.names
+        )
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def __iter__(self):
+        for callable_id in self.callables:
+            yield self.names[callable_id]
@@ -0,0 +1,357 @@
+import ast
+from types import FunctionType, MethodType
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from ._context import AnalysisContext
+from ._infer import node_position
+from ._mixin import DeepMixin, _Scope
+from ._trace import CallTrace
+
+# Used when the raised exception can't be named, like a bare `raise` outside of an except block.
+UNKNOWN = "EmptyRaise"
+
+# A bare raise outside of an except block, it re-raises whatever the caller is handling.
+_RERAISE = "<re-raise>"
+
+_CATCH_ALL = "BaseException"
+
+# The builtin exceptions `except Exception` doesn't catch, used when the raised class is unknown.
+_NOT_EXCEPTIONS = (
+    "SystemExit",
+    "KeyboardInterrupt",
+    "GeneratorExit",
+    "BaseExceptionGroup",
+)
+
+_Nested = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+
+class RaisedException(NamedTuple):
+    """An exception that can escape from a callable.
+
+    Attributes:
+        name (str): The name the exception is raised by, like `ValueError`.
+        exception (Optional[type]): The exception class, when it could be resolved.
+        path (Tuple[str, ...]): The callables the exception travels through, starting with the analyzed callable
+            and ending with the one that raises it.
+    """
+
+    name: str
+    exception: Optional[type]
+    path: Tuple[str, ...]
+
+
+_Raised = Dict[str, RaisedException]
+
+_Caught = List[Tuple[str, Optional[type]]]
+
+
+class RaisesAnalyzer(DeepMixin, ast.NodeVisitor):
+    """Finds every exception that can be raised by calling a callable.
+
+    Only `Raise`, `Try` and `Call` nodes are looked at, the bodies of nested functions and
+    classes are skipped because they don't run when the callable is called. Exceptions that
+    are caught by an enclosing `except` are dropped, unless the handler re-raises them.
+    The result of every callable is kept, so a helper is only analyzed once no matter how
+    many callers it has or how many callables are analyzed with the same instance.
+
+    Args:
+        context (Optional[AnalysisContext]): A context to share with other analyses.
+        trace (Optional[CallTrace]): Recorded calls to resolve call sites with.
+    """
+
+    _flat_traversal = False
+    _queued_expansion = False
+
+    def __init__(
+        self,
+        context: Optional[AnalysisContext] = None,
+        trace: Optional[CallTrace] = None,
+    ) -> None:
+        self.results: Dict[int, _Raised] = {}
+        self._frames: List[_Raised] = []
+        self._handled: List[Tuple[List[RaisedException], Optional[_Caught]]] = []
+        # The depth of every callable being analyzed, and for every depth the lowest one its result depends on.
+        self._in_progress: Dict[int, int] = {}
+        self._depends_on: List[int] = []
+        super().__init__(context=context, trace=trace)
+
+    def analyze(
+        self, callable: Union[FunctionType, MethodType]
+    ) -> List[RaisedException]:
+        """Return the exceptions that can escape from `callable`, in the order they were found."""
+
+        first_call = len(self.calls)
+
+        self.deep_visit(callable)
+
+        raised = self.results.get(self.calls.callables[first_call], {})
+
+        # Nothing calls `callable` from an except block, so what a bare raise re-raises is unknown.
+        found: _Raised = {}
+
+        for exception in raised.values():
+            if exception.name == _RERAISE:
+                exception = exception._replace(name=UNKNOWN)
+
+            found.setdefault(exception.name, exception)
+
+        return list(found.values())
+
+    def _visit_expansion(self, node: ast.AST, visit_tree: Callable[[Any], Any]) -> Any:
+        _, call = self._tree_items.get(id(node), (None, None))
+
+        if call is None:
+            return super()._visit_expansion(node, visit_tree)
+
+        callable_id = self.calls.callables[call]
+
+        raised = self.results.get(callable_id)
+
+        if raised is None and callable_id not in self._in_progress:
+            depth = len(self._depends_on)
+            self._in_progress[callable_id] = depth
+            self._depends_on.append(depth)
+            self._frames.append({})
+
+            # The result of a callable can't depend on the except block it's called from.
+            handled, self._handled = self._handled, []
+
+            try:
+                super()._visit_expansion(node, self._scan_root)
+            finally:
+                self._handled = handled
+                del self._in_progress[callable_id]
+                depends_on = self._depends_on.pop()
+                raised = self._frames.pop()
+
+            # A result that used the partial result of a caller is incomplete, it is only kept
+            # once that caller is done.
+            if depends_on == depth:
+                self.results[callable_id] = raised
+            else:
+                self._depends_on[-1] = min(self._depends_on[-1], depends_on)
+        else:
+            if raised is None:
+                # A recursive call that is still being analyzed.
+                self._depends_on[-1] = min(
+                    self._depends_on[-1], self._in_progress[callable_id]
+                )
+
+            self._tree_items.pop(id(node))
+
+        if self._frames and raised:
+            caller = self.calls.names[self.calls.callables[self.current_call]]
+
+            for exception in raised.values():
+                if exception.name == _RERAISE and self._handled:
+                    self._reraise_handled()
+                else:
+                    self._add(exception._replace(path=(caller,) + exception.path))
+
+        return None
+
+    def _add(self, exception: RaisedException):
+        # Keep the first, and so shortest found, path for every exception.
+        self._frames[-1].setdefault(exception.name, exception)
+
+    def _scan_root(self, tree: ast.AST):
+        for statement in getattr(tree, "body", []):
+
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._scan_function(statement)
+
+            # Calling a class runs its __init__
+            if isinstance(statement, ast.ClassDef):
+                for class_statement in statement.body:
+                    if (
+                        isinstance(class_statement, ast.FunctionDef)
+                        and class_statement.name == "__init__"
+                    ):
+                        self._scan_function(class_statement)
+
+    def _scan_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]):
+        self._scopes.append(_Scope(lambda: node, self.last_obj, []))
+
+        try:
+            self._scan_all(node.body)
+        finally:
+            self._scopes.pop()
+
+    def _scan_all(self, nodes: List[Any]):
+        for node in nodes:
+            self._scan(node)
+
+    def _scan(self, node: ast.AST):
+        if isinstance(node, (ast.Raise, ast.Try, ast.Call)):
+            self.visited_nodes += 1
+
+        if isinstance(node, ast.Raise):
+            self._scan_raise(node)
+
+        elif isinstance(node, ast.Try) or node.__class__.__name__ == "TryStar":
+            self._scan_try(node)  # type: ignore[arg-type]
+
+        elif isinstance(node, ast.Call):
+            self._proccess_call(node)
+
+        if isinstance(node, (ast.Raise, ast.Try)) or isinstance(node, _Nested):
+            return
+
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, _Nested):
+                self._scan(child)
+
+    def _scan_raise(self, node: ast.Raise):
+        if node.exc is not None:
+            self._scan(node.exc)
+
+            name, exception = self._exception_of(node.exc)
+            self._add(RaisedException(name, exception, (self._current_name(),)))
+            return
+
+        if not self._handled:
+            self._add(RaisedException(_RERAISE, None, (self._current_name(),)))
+            return
+
+        self._reraise_handled()
+
+    def _reraise_handled(self):
+        # A bare raise in an except block re-raises whatever the block caught.
+        caught, types = self._handled[-1]
+
+        for caught_exception in caught:
+            self._add(caught_exception)
+
+        # The handler can also catch exceptions we couldn't find, like ones raised by builtins.
+        names = {caught_exception.name for caught_exception in caught}
+
+        for name, exception_type in types or []:
+            if name not in names and name != _CATCH_ALL:
+                self._add(
+                    RaisedException(name, exception_type, (self._current_name(),))
+                )
+
+        if not caught and not types:
+            self._add(RaisedException(UNKNOWN, None, (self._current_name(),)))
+
+    def _scan_try(self, node: ast.Try):
+        self._frames.append({})
+
+        try:
+            self._scan_all(node.body)
+        finally:
+            raised = list(self._frames.pop().values())
+
+        handlers = [self._handler_types(handler) for handler in node.handlers]
+
+        caught_by: List[List[RaisedException]] = [[] for _ in handlers]
+
+        for exception in raised:
+            for caught, types in zip(caught_by, handlers):
+                # Only the first matching handler runs.
+                if _catches(types, exception):
+                    caught.append(exception)
+                    break
+            else:
+                self._add(exception)
+
+        for handler, caught, types in zip(node.handlers, caught_by, handlers):
+            self._handled.append((caught, types))
+
+            try:
+                self._scan_all(handler.body)
+            finally:
+                self._handled.pop()
+
+        self._scan_all(node.orelse)
+        self._scan_all(node.finalbody)
+
+    def _handler_types(self, handler: ast.ExceptHandler) -> Optional[_Caught]:
+        """The exceptions caught by `handler`, `None` means everything is caught."""
+
+        if handler.type is None:
+            return None
+
+        types = (
+            handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+        )
+
+        return [self._exception_of(expr) for expr in types]
+
+    def _exception_of(self, expr: ast.expr) -> Tuple[str, Optional[type]]:
+        position = node_position(expr)
+
+        if isinstance(expr, ast.Call):
+            expr = expr.func
+
+        # like `except Foo as error: raise error`
+        if isinstance(expr, ast.Name) and self._is_local(expr.id, position):
+            exception = self._infer_type(expr, position)
+            name = exception.__name__ if exception is not None else UNKNOWN
+            return name, exception
+
+        exception = self._resolve_value(expr, position, 0)
+
+        if not isinstance(exception, type):
+            exception = None
+
+        if isinstance(expr, ast.Name):
+            return expr.id, exception
+
+        if isinstance(expr, ast.Attribute):
+            return expr.attr, exception
+
+        return UNKNOWN, exception
+
+    def _is_local(self, name: str, position) -> bool:
+        return (
+            bool(self._scopes) and self._scopes[-1].lookup(name, position) is not None
+        )
+
+    def _current_name(self) -> str:
+        return self.calls.names[self.calls.callables[self.current_call]]
+
+
+def _catches(caught: Optional[_Caught], exception: RaisedException) -> bool:
+    if caught is None:
+        return True
+
+    for name, handler_type in caught:
+
+        if name == _CATCH_ALL or name == exception.name:
+            return True
+
+        if name == "Exception" and handler_type in (None, Exception):
+            if exception.exception is not None:
+                caught_by_exception = issubclass(exception.exception, Exception)
+            else:
+                caught_by_exception = exception.name not in _NOT_EXCEPTIONS
+
+            if caught_by_exception:
+                return True
+
+            continue
+
+        if (
+            handler_type is not None
+            and exception.exception is not None
+            and issubclass(exception.exception, handler_type)
+        ):
+            return True
+
+    return False
+
+
+def find_raises(
+    callable: Union[FunctionType, MethodType],
+    context: Optional[AnalysisContext] = None,
+) -> List[RaisedException]:
+    """Return every exception that can escape from `callable`.
+
+    Args:
+        callable (Union[FunctionType, MethodType]): The function or method to analyze.
+        context (Optional[AnalysisContext]): A context to share with other analyses.
+    """
+
+    return RaisesAnalyzer(context).analyze(callable)
@@ -0,0 +1,383 @@
+import inspect
+import marshal
+import sys
+import threading
+from array import array
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# (filename, first line, name) of a code object.
+TraceLocation = Tuple[str, int, str]
+
+# The callee of a call that didn't start any python code, like a call to a builtin.
+NATIVE = -1
+
+_MISSING = -1
+
+_THIS_FILE = __file__
+
+# (caller code, instruction offset, line, started code)
+_RawCall = Tuple[CodeType, int, Optional[int], Optional[CodeType]]
+
+
+class CallTrace:
+    """The calls that were made while a workload ran, as a table of caller to callee edges.
+
+    Every edge goes from a call site, the position in the caller's source where the call
+    expression ends, to the location of the code the call started. Call sites that only
+    called builtins have a single `NATIVE` edge, so it is known they were reached.
+
+    Attributes:
+        locations (List[TraceLocation]): The interned code locations, as (filename, first line, name).
+        callers (array): The location of the caller of every edge.
+        lines (array): The line every call ends on.
+        columns (array): The column every call ends at, -1 before python 3.11 where only lines are known.
+        callees (array): The location of the callee of every edge, `NATIVE` when no python code was started.
+    """
+
+    def __init__(self) -> None:
+        self.locations: List[TraceLocation] = []
+        self.callers = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+        self.callees = array("i")
+        self._location_ids: Dict[TraceLocation, int] = {}
+        self._edges: Set[Tuple[int, int, int, int]] = set()
+        self._sites: Optional[Dict[Tuple[str, int], List[int]]] = None
+        self._modules: Dict[str, Any] = {}
+        self._callables: Dict[str, Dict[Tuple[int, str], Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.callers)
+
+    def add(
+        self,
+        caller: TraceLocation,
+        line: int,
+        column: int,
+        callee: Optional[TraceLocation],
+    ):
+        """Add an edge, edges that are already in the table are ignored."""
+
+        edge = (
+            self._intern(caller),
+            line,
+            column,
+            NATIVE if callee is None else self._intern(callee),
+        )
+
+        if edge in self._edges:
+            return
+
+        self._edges.add(edge)
+        self.callers.append(edge[0])
+        self.lines.append(line)
+        self.columns.append(column)
+        self.callees.append(edge[3])
+        self._sites = None
+
+    def callees_at(
+        self, filename: str, start_line: int, end_line: int, end_column: int
+    ) -> Optional[List[Tuple[int, TraceLocation]]]:
+        """The edges and callee locations of the call expression at this position, `None` if it never ran.
+
+        Edges with a column must end exactly at `end_line` and `end_column`, edges without
+        one match any line of the call.
+        """
+
+        sites = self._site_index()
+
+        found = False
+        callees: List[Tuple[int, TraceLocation]] = []
+
+        for line in range(start_line, end_line + 1):
+            for edge in sites.get((filename, line), []):
+                column = self.columns[edge]
+
+                if column == _MISSING or (line == end_line and column == end_column):
+                    found = True
+
+                    if self.callees[edge] != NATIVE:
+                        callees.append((edge, self.locations[self.callees[edge]]))
+
+        return callees if found else None
+
+    def callable_at(self, location: TraceLocation) -> Any:
+        """The module level function or method whose code is at `location`, if it can be found."""
+
+        filename, first_line, name = location
+
+        callables = self._callables.get(filename)
+
+        if callables is None:
+            module = self._module_of(filename)
+            callables = _index_callables(module, filename) if module else {}
+            self._callables[filename] = callables
+
+        return callables.get((first_line, name))
+
+    def to_bytes(self) -> bytes:
+        return marshal.dumps(
+            (
+                self.locations,
+                self.callers.tobytes(),
+                self.lines.tobytes(),
+                self.columns.tobytes(),
+                self.callees.tobytes(),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CallTrace":
+        locations, callers, lines, columns, callees = marshal.loads(data)
+
+        trace = cls()
+
+        for location in locations:
+            trace._intern(tuple(location))  # type: ignore[arg-type]
+
+        trace.callers.frombytes(callers)
+        trace.lines.frombytes(lines)
+        trace.columns.frombytes(columns)
+        trace.callees.frombytes(callees)
+        trace._edges = set(
+            zip(trace.callers, trace.lines, trace.columns, trace.callees)
+        )
+
+        return trace
+
+    def _intern(self, location: TraceLocation) -> int:
+        location_id = self._location_ids.get(location)
+
+        if location_id is None:
+            location_id = len(self.locations)
+            self._location_ids[location] = location_id
+            self.locations.append(location)
+
+        return location_id
+
+    def _site_index(self) -> Dict[Tuple[str, int], List[int]]:
+        if self._sites is None:
+            self._sites = {}
+
+            for edge, (caller, line) in enumerate(zip(self.callers, self.lines)):
+                filename = self.locations[caller][0]
+                self._sites.setdefault((filename, line), []).append(edge)
+
+        return self._sites
+
+    def _module_of(self, filename: str) -> Any:
+        if filename not in self._modules:
+            # Modules can be imported after the last search, so look again for every new file.
+            for module in list(sys.modules.values()):
+                module_file = getattr(module, "__file__", None)
+
+                if module_file is not None:
+                    self._modules.setdefault(module_file, module)
+
+        return self._modules.get(filename)
+
+
+def _index_callables(module: Any, filename: str) -> Dict[Tuple[int, str], Any]:
+    callables: Dict[Tuple[int, str], Any] = {}
+
+    def add(obj: Any):
+        try:
+            func = inspect.unwrap(getattr(obj, "__func__", obj))
+        except ValueError:
+            return
+
+        code = getattr(func, "__code__", None)
+
+        if isinstance(code, CodeType) and code.co_filename == filename:
+            callables.setdefault((code.co_firstlineno, code.co_name), func)
+
+    classes = [
+        obj
+        for obj in vars(module).values()
+        if isinstance(obj, type) and obj.__module__ == module.__name__
+    ]
+
+    for obj in vars(module).values():
+        add(obj)
+
+    seen: Set[type] = set()
+
+    while classes:
+        cls = classes.pop()
+
+        if cls in seen:
+            continue
+
+        seen.add(cls)
+
+        for attr in vars(cls).values():
+            if isinstance(attr, type) and attr.__module__ == module.__name__:
+                classes.append(attr)
+            else:
+                add(attr)
+
+    return callables
+
+
+def _location(code: CodeType) -> TraceLocation:
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def source_origin(item: Any) -> Optional[Tuple[str, int, int]]:
+    """The file and first line of the source of `item`, and how much `textwrap.dedent` removes from it."""
+
+    func = getattr(item, "__func__", item)
+    code = getattr(func, "__code__", None)
+
+    try:
+        filename = code.co_filename if code is not None else inspect.getfile(func)
+        lines, first_line = inspect.getsourcelines(func)
+    except (OSError, TypeError):
+        return None
+
+    margin = min(
+        (len(line) - len(line.lstrip()) for line in lines if line.strip()), default=0
+    )
+
+    return filename, first_line, margin
+
+
+class TraceRecorder:
+    """Records a `CallTrace` of the calls made inside a `with` block.
+
+    Uses `sys.monitoring` on python 3.12 and newer, and `sys.setprofile` before that.
+    With `sys.monitoring` calls made by every thread are recorded, before python 3.12 only the
+    calls of the current thread and of threads started inside the block are.
+
+    Args:
+        trace (Optional[CallTrace]): A trace to add the calls to, a new trace is created if omitted.
+
+    Attributes:
+        trace (CallTrace): The recorded calls, complete once the `with` block exits.
+    """
+
+    def __init__(self, trace: Optional[CallTrace] = None) -> None:
+        self.trace = trace if trace is not None else CallTrace()
+        self._calls: Set[_RawCall] = set()
+        self._tool: Optional[int] = None
+        self._previous: Any = None
+
+    def __enter__(self) -> "TraceRecorder":
+        if hasattr(sys, "monitoring"):
+            self._start_monitoring()
+        else:
+            self._start_profiling()
+
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._tool is not None:
+            self._stop_monitoring()
+        else:
+            self._stop_profiling()
+
+        self._add_calls()
+
+    def _start_monitoring(self):
+        monitoring = sys.monitoring  # type: ignore[attr-defined]
+
+        tools = [monitoring.PROFILER_ID, 3, 4, 5]
+        free = [tool for tool in tools if monitoring.get_tool(tool) is None]
+
+        if not free:
+            raise Exception("No free sys.monitoring tool id to record calls with")
+
+        self._tool = free[0]
+        monitoring.use_tool_id(self._tool, "deep-ast")
+
+        monitoring.register_callback(
+            self._tool, monitoring.events.PY_START, self._on_start
+        )
+        monitoring.register_callback(self._tool, monitoring.events.CALL, self._on_call)
+        monitoring.set_events(
+            self._tool, monitoring.events.PY_START | monitoring.events.CALL
+        )
+
+    def _stop_monitoring(self):
+        monitoring = sys.monitoring  # type: ignore[attr-defined]
+
+        monitoring.set_events(self._tool, 0)
+        monitoring.register_callback(self._tool, monitoring.events.PY_START, None)
+        monitoring.register_callback(self._tool, monitoring.events.CALL, None)
+        monitoring.free_tool_id(self._tool)
+        self._tool = None
+
+    def _on_start(self, code: CodeType, offset: int):
+        caller = sys._getframe(1).f_back
+
+        if caller is not None:
+            self._calls.add((caller.f_code, caller.f_lasti, caller.f_lineno, code))
+
+    def _on_call(self, code: CodeType, offset: int, callable: Any, arg0: Any):
+        # Returning DISABLE would need a process wide `restart_events()` for the next recording
+        # to see the call site again, so repeated calls are only deduplicated.
+        self._calls.add((code, offset, _MISSING, None))
+
+    def _start_profiling(self):
+        self._previous = sys.getprofile()
+        sys.setprofile(self._profile)
+        threading.setprofile(self._profile)
+
+    def _stop_profiling(self):
+        sys.setprofile(self._previous)
+        threading.setprofile(self._previous)
+
+    def _profile(self, frame: FrameType, event: str, arg: Any):
+        if event == "call":
+            caller = frame.f_back
+
+            if caller is not None:
+                self._calls.add(
+                    (caller.f_code, caller.f_lasti, caller.f_lineno, frame.f_code)
+                )
+
+        elif event == "c_call":
+            self._calls.add((frame.f_code, frame.f_lasti, frame.f_lineno, None))
+
+    def _add_calls(self):
+        positions: Dict[CodeType, List[Tuple[Any, ...]]] = {}
+
+        for caller, offset, line, callee in self._calls:
+
+            if caller.co_filename == _THIS_FILE or (
+                callee is not None and callee.co_filename == _THIS_FILE
+            ):
+                continue
+
+            column = _MISSING
+
+            if hasattr(caller, "co_positions"):
+                if caller not in positions:
+                    positions[caller] = list(caller.co_positions())
+
+                _, end_line, _, end_column = positions[caller][offset // 2]
+
+                if end_line is not None and end_column is not None:
+                    line, column = end_line, end_column
+
+            if line is None or line == _MISSING:
+                continue
+
+            self.trace.add(
+                _location(caller),
+                line,
+                column,
+                _location(callee) if callee is not None else None,
+            )
+
+        self._calls.clear()
+
+
+def record_trace(workload: Callable[..., Any], *args: Any, **kwargs: Any) -> CallTrace:
+    """Run `workload(*args, **kwargs)` and return the calls it made."""
+
+    with TraceRecorder() as recorder:
+        workload(*args, **kwargs)
+
+    return recorder.trace
@@ -0,0 +1,215 @@
+import ast
+import copy
+import inspect
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class _Edit(NamedTuple):
+    start: int
+    end: int
+    indent: str
+    tree: ast.AST
+
+
+class TransformedSources:
+    """Collects the transformed trees of every callable a `DeepTransformer` expanded, grouped by source file."""
+
+    def __init__(self) -> None:
+        self.files: Dict[str, Dict[int, _Edit]] = {}
+
+    def add(self, item: Any, tree: ast.AST):
+        try:
+            filename = inspect.getsourcefile(item)
+            lines, start = inspect.getsourcelines(item)
+        except (OSError, TypeError):
+            return
+
+        if filename is None:
+            return
+
+        # Modules report a start of 0
+        start = max(start, 1)
+        indent = lines[0][: len(lines[0]) - len(lines[0].lstrip())]
+
+        # The same callable can be expanded many times, the last transform wins.
+        self.files.setdefault(filename, {})[start] = _Edit(
+            start, start + len(lines) - 1, indent, tree
+        )
+
+    def unparse(self) -> Dict[str, str]:
+        """Return the new source of every file that had at least one callable transformed.
+
+        Each file is read and rewritten once, no matter how many of its callables changed.
+        """
+
+        if not hasattr(ast, "unparse"):
+            raise Exception("Unparsing transformed code requires python 3.9 or newer")
+
+        sources = {}
+
+        for filename, edits in self.files.items():
+            with open(filename, encoding="utf-8") as source_file:
+                lines = source_file.read().splitlines(keepends=True)
+
+            for edit in _non_overlapping(edits):
+                new_source = ast.unparse(edit.tree)  # type: ignore[attr-defined]
+                new_lines = [
+                    f"{edit.indent}{line}\n" if line else "\n"
+                    for line in new_source.splitlines()
+                ]
+                lines[edit.start - 1 : edit.end] = new_lines
+
+            sources[filename] = "".join(lines)
+
+        return sources
+
+    def write(self) -> List[str]:
+        """Write the transformed sources back to disk and return the files that were written."""
+
+        sources = self.unparse()
+
+        for filename, source in sources.items():
+            with open(filename, "w", encoding="utf-8") as source_file:
+                source_file.write(source)
+
+        return list(sources)
+
+
+def _non_overlapping(edits: Dict[int, _Edit]) -> List[_Edit]:
+    """Edits sorted from the bottom of the file up, dropping any nested in an earlier one."""
+
+    kept: List[_Edit] = []
+    covered_until = 0
+
+    # A method nested in a transformed class is already part of the class edit.
+    for edit in sorted(edits.values()):
+        if edit.start <= covered_until:
+            continue
+
+        kept.append(edit)
+        covered_until = edit.end
+
+    return list(reversed(kept))
+
+
+class CopyOnWriteTransformer(ast.NodeTransformer):
+    """A NodeTransformer that never modifies the tree it is visiting.
+
+    Each `visit_*` method receives a shallow copy of the node with its own child lists,
+    while the children themselves are still shared. If the copy comes back unchanged the
+    original node is returned. Nodes without a `visit_*` method aren't copied at all, only
+    when one of their children comes back different. So only nodes that were replaced or
+    modified, and the nodes above them, are ever materialized.
+    """
+
+    def __init__(self) -> None:
+        self.transformed_sources = TransformedSources()
+        self._visitors: Dict[type, Optional[Callable[[Any], Any]]] = {}
+        super().__init__()
+
+    def visit(self, node: ast.AST) -> Any:
+        node_class = node.__class__
+
+        if node_class not in self._visitors:
+            self._visitors[node_class] = getattr(
+                self, "visit_" + node_class.__name__, None
+            )
+
+        visitor = self._visitors[node_class]
+
+        if visitor is None:
+            return self._visit_children(node)
+
+        view = _shallow_copy(node)
+
+        result = visitor(view)
+
+        if result is view and _unchanged(node, view):
+            return node
+
+        return result
+
+    def _visit_children(self, node: ast.AST) -> ast.AST:
+        """Like `generic_visit`, but `node` is only copied when one of its children changed."""
+
+        copied: Optional[ast.AST] = None
+
+        for field, old_value in ast.iter_fields(node):
+
+            if isinstance(old_value, list):
+                new_values = self._visit_list(old_value)
+
+                if new_values is not None:
+                    copied = copied or copy.copy(node)
+                    setattr(copied, field, new_values)
+
+            elif isinstance(old_value, ast.AST):
+                new_node = self.visit(old_value)
+
+                if new_node is old_value:
+                    continue
+
+                copied = copied or copy.copy(node)
+
+                if new_node is None:
+                    delattr(copied, field)
+                else:
+                    setattr(copied, field, new_node)
+
+        return copied if copied is not None else node
+
+    def _visit_list(self, values: List[Any]) -> Optional[List[Any]]:
+        """The visited values, or `None` when every value came back unchanged."""
+
+        new_values: Optional[List[Any]] = None
+
+        for index, value in enumerate(values):
+            if not isinstance(value, ast.AST):
+                if new_values is not None:
+                    new_values.append(value)
+                continue
+
+            new_value = self.visit(value)
+
+            if new_value is value and new_values is None:
+                continue
+
+            if new_values is None:
+                new_values = values[:index]
+
+            # The same rules as ast.NodeTransformer.generic_visit.
+            if new_value is None:
+                continue
+            elif not isinstance(new_value, ast.AST):
+                new_values.extend(new_value)
+            else:
+                new_values.append(new_value)
+
+        return new_values
+
+
+def _shallow_copy(node: ast.AST) -> ast.AST:
+    view = copy.copy(node)
+
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, list):
+            setattr(view, field, list(value))
+
+    return view
+
+
+def _unchanged(node: ast.AST, view: ast.AST) -> bool:
+    original: Dict[str, Any] = vars(node)
+    copied: Dict[str, Any] = vars(view)
+
+    if original.keys() != copied.keys():
+        return False
+
+    return all(_same(value, copied[key]) for key, value in original.items())
+
+
+def _same(a: Any, b: Any) -> bool:
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(x is y for x, y in zip(a, b))
+
+    return a is b
@@ -28,3 +28,42 @@ class Foo:
 class Bar:
     def bazz(self):
         print("bazz")
+
+
+class Baz:
+    def bazz(self):
+        print("baz")
+
+
+class Copyable:
+    def clone(self) -> "Copyable":
+        return Copyable()
+
+    def target(self):
+        print("target")
+
+
+def make_bar() -> Bar:
+    return Bar()
+
+
+class Typed:
+    def annotated(self, bar: Bar):
+        bar.bazz()
+
+    def returned(self):
+        bar = make_bar()
+        bar.bazz()
+
+    def reassigned(self):
+        obj = Baz()
+        obj = Bar()
+        obj.bazz()
+
+    def cloned(self):
+        obj = Copyable()
+        obj = obj.clone()
+        obj.target()
+
+    def unknown(self):
+        self.callback()
@@ -0,0 +1,42 @@
+class Shape:
+    def area(self):
+        raise NotImplementedError()
+
+
+class Square(Shape):
+    def __init__(self, side):
+        self.side = side
+
+    def area(self):
+        return self.side * self.side
+
+
+class Circle(Shape):
+    def area(self):
+        raise ValueError("unsupported")
+
+
+class Pipeline:
+    def step(self):
+        raise KeyError("step")
+
+
+def double(value):
+    return value * 2
+
+
+def pick_step():
+    return double
+
+
+def total_area(shapes):
+    return sum(shape.area() for shape in shapes)
+
+
+def run_step():
+    step = pick_step()
+    return step(2)
+
+
+def describe(shapes):
+    return len(shapes)
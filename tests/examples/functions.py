@@ -1,3 +1,6 @@
+from math import floor
+
+
 def func_a():
     print("foo")
 
@@ -13,3 +16,20 @@ def func_c():
 def func_d():
     func_a()
     func_c()
+
+
+def func_e():
+    raise ValueError("bad")
+
+
+def func_f():
+    func_a()
+    func_e()
+
+
+def func_g():
+    func_g()
+
+
+def func_h():
+    return floor(1.5)
@@ -0,0 +1,114 @@
+class CustomError(ValueError):
+    pass
+
+
+def raise_value():
+    raise ValueError("bad")
+
+
+def raise_custom():
+    raise CustomError()
+
+
+def raise_key():
+    raise KeyError("missing")
+
+
+def catch_value():
+    try:
+        raise_value()
+    except ValueError:
+        pass
+
+
+def catch_parent():
+    try:
+        raise_custom()
+        raise_key()
+    except ValueError:
+        return None
+
+
+def reraise():
+    try:
+        raise_key()
+    except KeyError:
+        cleanup()
+        raise
+
+
+def reraise_all():
+    try:
+        raise_value()
+        raise_key()
+    except:  # noqa: E722
+        raise
+
+
+def catch_exception():
+    try:
+        raise_value()
+        raise SystemExit(1)
+    except Exception:
+        pass
+
+
+def catch_exception_or_exit():
+    try:
+        raise SystemExit(1)
+    except (Exception, SystemExit):
+        pass
+
+
+def log_and_reraise():
+    raise
+
+
+def handle_key():
+    try:
+        raise_key()
+    except KeyError:
+        log_and_reraise()
+
+
+def handle_os():
+    try:
+        cleanup()
+    except OSError:
+        log_and_reraise()
+
+
+def wrap():
+    try:
+        raise_key()
+    except KeyError as error:
+        raise RuntimeError() from error
+
+
+def nested_function():
+    def inner():
+        raise TypeError()
+
+    return inner
+
+
+def cleanup():
+    raise OSError()
+
+
+def recursive(count):
+    if count:
+        recursive(count - 1)
+
+    raise_value()
+
+
+def ping(count):
+    if count:
+        pong(count - 1)
+
+    raise ValueError()
+
+
+def pong(count):
+    ping(count)
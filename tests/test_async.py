@@ -0,0 +1,162 @@
+import asyncio
+import threading
+from http.client import HTTPConnection
+
+import pytest
+
+from deep_ast import AnalysisContext, DeepVisitor, FusedVisitor, RaisesAnalyzer
+from tests.examples.classes import Child
+from tests.examples.functions import func_d, func_g
+from tests.test_http_client import ParseExceptions
+
+
+def test_matches_deep_visit():
+
+    expected = ParseExceptions()
+    expected.deep_visit(HTTPConnection.getresponse)
+
+    v = ParseExceptions()
+    asyncio.run(v.deep_visit_async(HTTPConnection.getresponse))
+
+    assert v.visited_nodes == expected.visited_nodes
+    assert sorted(v.parent_nodes) == sorted(expected.parent_nodes)
+    assert sorted(v.found_exceptions) == sorted(expected.found_exceptions)
+
+
+def test_call_tree():
+
+    v = DeepVisitor()
+    asyncio.run(v.deep_visit_async(func_d))
+
+    assert v.parent_nodes == ["func_d()", "func_a()", "func_c()"]
+    assert list(v.calls.parents) == [-1, 0, 0]
+    assert v.call_path(2) == ["func_d()", "func_c()"]
+
+
+def test_yields_between_expansions():
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        ticker = asyncio.ensure_future(tick())
+
+        v = DeepVisitor()
+        await v.deep_visit_async(func_d)
+
+        ticker.cancel()
+
+    asyncio.run(main())
+
+    assert ticks >= 3
+
+
+def test_cancellation():
+
+    v = DeepVisitor()
+
+    async def main():
+        task = asyncio.ensure_future(v.deep_visit_async(HTTPConnection.getresponse))
+
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert len(v.calls) < 56
+
+    # The visitor can still be used after a cancelled traversal.
+    v = DeepVisitor()
+    v.deep_visit(func_d)
+    assert v.parent_nodes == ["func_d()", "func_a()", "func_c()"]
+
+
+def test_concurrent_analyses():
+
+    context = AnalysisContext()
+
+    async def analyze():
+        v = ParseExceptions(context=context)
+        await v.deep_visit_async(HTTPConnection.getresponse)
+        return v
+
+    async def main():
+        return await asyncio.gather(analyze(), analyze())
+
+    first, second = asyncio.run(main())
+
+    assert first.found_exceptions == second.found_exceptions
+    assert first.visited_nodes == second.visited_nodes
+
+
+def test_recursion():
+
+    v = DeepVisitor()
+    asyncio.run(v.deep_visit_async(func_g))
+
+    # The recursive call is recorded but not expanded again.
+    assert v.parent_nodes == ["func_g()", "func_g()"]
+
+
+def test_fused():
+
+    exceptions = ParseExceptions()
+
+    asyncio.run(FusedVisitor([exceptions]).deep_visit_async(HTTPConnection.getresponse))
+
+    expected = ParseExceptions()
+    expected.deep_visit(HTTPConnection.getresponse)
+
+    assert sorted(exceptions.found_exceptions) == sorted(expected.found_exceptions)
+
+
+def test_inline_only():
+
+    with pytest.raises(Exception):
+        asyncio.run(RaisesAnalyzer().deep_visit_async(func_d))
+
+
+class _ThreadContext(AnalysisContext):
+    def __init__(self) -> None:
+        self.threads = set()
+        super().__init__()
+
+    def members(self, module):
+        if not self.has_members(module):
+            self.threads.add(threading.get_ident())
+
+        return super().members(module)
+
+
+class _ThreadVisitor(DeepVisitor):
+    def _get_source(self, item):
+        self.context.threads.add(threading.get_ident())
+        return super()._get_source(item)
+
+
+def test_lookups_run_in_executor():
+
+    context = _ThreadContext()
+    v = _ThreadVisitor(context=context)
+
+    async def main():
+        v.context.threads.clear()
+        await v.deep_visit_async(Child.example_a)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+
+    assert v.parent_nodes == ["Child.example_a()", "Parent.example_a()"]
+    assert context.has_class_def(Child)
+    assert context.threads and loop_thread not in context.threads
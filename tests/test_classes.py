@@ -5,11 +5,11 @@ from typing import Any
 import pytest
 
 from deep_ast import DeepVisitor
-from tests.examples.classes import Child, Foo
+from tests.examples.classes import Child, Foo, Typed
 
 
 @pytest.mark.skipif(
-    sys.version_info != (3, 9),
+    sys.version_info[:2] != (3, 9),
     reason="The number of nodes visitied varies between python versions?",
 )
 def test_single_method():
@@ -39,7 +39,7 @@ def test_single_method():
 
 
 @pytest.mark.skipif(
-    sys.version_info != (3, 9),
+    sys.version_info[:2] != (3, 9),
     reason="The number of nodes visitied varies between python versions?",
 )
 def test_nested_method():
@@ -78,7 +78,6 @@ def test_nested_method():
     assert v.raw_nodes == expected_nodes
 
 
-@pytest.mark.xfail(strict=True)
 def test_multiple_objects():
 
     expected_parent_nodes = ["Foo.method_c()", "Bar.init()", "Bar.bazz()"]
@@ -131,6 +130,68 @@ def test_multiple_objects():
     assert v.raw_nodes == expected_nodes
 
 
+def test_annotated_argument():
+
+    v = DeepVisitor()
+
+    v.deep_visit(Typed.annotated)
+
+    assert v.parent_nodes == ["Typed.annotated()", "Bar.bazz()"]
+    assert v.inferred_calls == 1
+
+
+def test_return_annotation():
+
+    v = DeepVisitor()
+
+    v.deep_visit(Typed.returned)
+
+    assert v.parent_nodes == [
+        "Typed.returned()",
+        "make_bar()",
+        "Bar.init()",
+        "Bar.bazz()",
+    ]
+    assert v.inferred_calls == 1
+
+
+def test_latest_assignment_wins():
+
+    v = DeepVisitor()
+
+    v.deep_visit(Typed.reassigned)
+
+    assert v.parent_nodes[-1] == "Bar.bazz()"
+    assert "Baz.bazz()" not in v.parent_nodes
+
+
+def test_reassigned_from_itself():
+
+    v = DeepVisitor()
+
+    v.deep_visit(Typed.cloned)
+
+    assert v.parent_nodes == [
+        "Typed.cloned()",
+        "Copyable.init()",
+        "Copyable.clone()",
+        "Copyable.target()",
+    ]
+
+
+def test_unknown_self_attribute():
+
+    v = DeepVisitor()
+
+    v.deep_visit(Typed.unknown)
+
+    assert v.parent_nodes == ["Typed.unknown()"]
+    assert v.avoided_searches == 1
+    assert [
+        record.name for record in v.diagnostics.records("not defined by the class")
+    ] == ["Typed.callback"]
+
+
 def test_super():
 
     expected_parent_nodes = ["Child.example_a()", "Parent.example_a()"]
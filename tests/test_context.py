@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+
+from deep_ast import AnalysisContext, DeepVisitor
+from tests.examples.classes import Child
+from tests.examples.functions import func_b, func_d
+from tests.test_http_client import ParseExceptions
+
+
+def test_shared_parse_cache():
+
+    context = AnalysisContext()
+
+    first = DeepVisitor(context=context)
+    first.deep_visit(func_d)
+
+    second = DeepVisitor(context=context)
+    second.deep_visit(func_b)
+
+    assert second.parent_nodes == ["func_b()", "func_a()"]
+    assert context.parse_cache.misses == 4
+    assert context.parse_cache.hits == 1
+
+
+def test_shared_class_defs():
+
+    context = AnalysisContext()
+
+    for _ in range(2):
+        v = DeepVisitor(context=context)
+        v.deep_visit(Child.example_a)
+
+        assert v.parent_nodes == ["Child.example_a()", "Parent.example_a()"]
+
+    assert list(context._class_defs) == [Child]
+
+
+def test_threads():
+
+    expected = ParseExceptions()
+    expected.deep_visit(HTTPConnection.getresponse)
+
+    context = AnalysisContext()
+
+    def analyze(_):
+        parser = ParseExceptions(context=context)
+        parser.deep_visit(HTTPConnection.getresponse)
+        return parser
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        parsers = list(pool.map(analyze, range(8)))
+
+    for parser in parsers:
+        assert parser.visited_nodes == expected.visited_nodes
+        assert parser.raw_exceptions == expected.raw_exceptions
+        assert parser.parent_nodes == expected.parent_nodes
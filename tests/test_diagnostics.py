@@ -0,0 +1,65 @@
+from http.client import HTTPConnection
+
+from deep_ast import DeepVisitor, Diagnostic, Diagnostics
+from tests.examples.functions import func_d, func_h
+
+
+def test_silent_by_default(capsys):
+
+    v = DeepVisitor()
+    v.deep_visit(HTTPConnection.getresponse)
+
+    assert capsys.readouterr().out == ""
+    assert v.diagnostics.records("parent class not found")
+
+
+def test_records():
+
+    v = DeepVisitor()
+    v.deep_visit(func_d)
+
+    assert v.diagnostics.records() == [
+        Diagnostic("print", "not found", ("func_a()", 2, 4), 1),
+        Diagnostic("print", "not found", ("func_c()", 2, 4), 1),
+    ]
+
+
+def test_builtin():
+
+    v = DeepVisitor()
+    v.deep_visit(func_h)
+
+    assert v.diagnostics.records("built-in") == [
+        Diagnostic("floor", "built-in", ("func_h()", 2, 11), 1)
+    ]
+
+
+def test_aggregates():
+
+    v = DeepVisitor()
+    v.deep_visit(func_d)
+    v.deep_visit(func_d)
+
+    assert len(v.diagnostics) == 2
+    assert [record.occurrences for record in v.diagnostics] == [2, 2]
+
+
+def test_sink():
+
+    seen = []
+
+    diagnostics = Diagnostics(sink=seen.append)
+
+    DeepVisitor(diagnostics=diagnostics).deep_visit(func_d)
+    DeepVisitor(diagnostics=diagnostics).deep_visit(func_d)
+
+    # Only the first occurrence of every record is passed to the sink.
+    assert seen == [
+        Diagnostic("print", "not found", ("func_a()", 2, 4), 1),
+        Diagnostic("print", "not found", ("func_c()", 2, 4), 1),
+    ]
+    assert diagnostics.records()[0].occurrences == 2
+
+    diagnostics.clear()
+
+    assert len(diagnostics) == 0
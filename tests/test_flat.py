@@ -0,0 +1,145 @@
+import ast
+import http.client
+import inspect
+import marshal
+from http.client import HTTPConnection
+
+import pytest
+
+from deep_ast import (
+    AnalysisContext,
+    DeepVisitor,
+    FlatTree,
+    FusedVisitor,
+    ParseCache,
+    build_call_graph,
+)
+from tests.examples.functions import func_d, func_f
+from tests.test_fused import CountCalls
+from tests.test_http_client import ParseExceptions
+
+
+def _compact_context() -> AnalysisContext:
+    return AnalysisContext(ParseCache(compact=True))
+
+
+def test_round_trip():
+
+    tree = ast.parse(inspect.getsource(http.client))
+
+    flat = FlatTree.from_ast(tree)
+
+    expected = ast.dump(tree, include_attributes=True)
+
+    assert ast.dump(flat.node(), include_attributes=True) == expected
+
+    loaded = FlatTree.from_bytes(flat.to_bytes())
+
+    assert ast.dump(loaded.node(), include_attributes=True) == expected
+
+
+def _with_kind_names(data: bytes, rename) -> bytes:
+    kind_names, *rest = marshal.loads(data)
+    return marshal.dumps(([rename(name) for name in kind_names], *rest))
+
+
+def test_unknown_kinds():
+
+    tree = ast.parse("def f(x):\n    return x + 1\n")
+
+    data = FlatTree.from_ast(tree).to_bytes()
+
+    # Kinds the tree doesn't use may have been removed in this python version.
+    unused = _with_kind_names(
+        data, lambda name: "Removed" if name == "Lambda" else name
+    )
+
+    assert ast.dump(FlatTree.from_bytes(unused).node()) == ast.dump(tree)
+
+    used = _with_kind_names(data, lambda name: "Removed" if name == "Return" else name)
+
+    with pytest.raises(Exception, match="Removed"):
+        FlatTree.from_bytes(used)
+
+
+def test_children_order():
+
+    tree = ast.parse(inspect.getsource(func_d))
+
+    flat = FlatTree.from_ast(tree)
+
+    def walk(index):
+        yield flat.kind(index).__name__
+        for child in flat.children(index):
+            yield from walk(child)
+
+    class Order(ast.NodeVisitor):
+        def __init__(self) -> None:
+            self.order = []
+
+        def generic_visit(self, node):
+            self.order.append(node.__class__.__name__)
+            super().generic_visit(node)
+
+    order = Order()
+    order.visit(tree)
+
+    assert list(walk(0)) == order.order
+
+
+def test_compact_traversal_matches():
+
+    expected = ParseExceptions()
+    expected.deep_visit(HTTPConnection.getresponse)
+
+    parser = ParseExceptions(context=_compact_context())
+    parser.deep_visit(HTTPConnection.getresponse)
+
+    assert parser.visited_nodes == expected.visited_nodes
+    assert parser.raw_nodes == expected.raw_nodes
+    assert parser.raw_exceptions == expected.raw_exceptions
+    assert parser.parent_nodes == expected.parent_nodes
+    assert parser.node_calls == expected.node_calls
+
+
+def test_compact_fused():
+
+    expected = CountCalls()
+    expected.deep_visit(HTTPConnection.getresponse)
+
+    calls = CountCalls()
+    FusedVisitor([calls], context=_compact_context()).deep_visit(
+        HTTPConnection.getresponse
+    )
+
+    assert calls.calls_by_name == expected.calls_by_name
+
+
+def test_compact_call_graph():
+
+    graph = build_call_graph([func_d, func_f], context=_compact_context())
+
+    assert graph.entry_points_with("Raise ValueError") == ["func_f()"]
+    assert graph.entry_points_reaching("func_a()") == ["func_d()", "func_f()"]
+
+
+class CountGeneric(DeepVisitor):
+    def __init__(self, context=None) -> None:
+        self.generic_visits = 0
+        super().__init__(context=context)
+
+    def generic_visit(self, node: ast.AST):
+        self.generic_visits += 1
+        return super().generic_visit(node)
+
+
+def test_generic_visit_override():
+
+    visitor = CountGeneric()
+    visitor.deep_visit(func_d)
+
+    compact = CountGeneric(_compact_context())
+    compact.deep_visit(func_d)
+
+    assert compact.generic_visits == visitor.generic_visits
+    assert compact.visited_nodes == visitor.visited_nodes
@@ -7,7 +7,7 @@ from tests.examples.functions import func_a, func_b, func_d
 
 
 @pytest.mark.skipif(
-    sys.version_info != (3, 9),
+    sys.version_info[:2] != (3, 9),
     reason="The number of nodes visitied varies between python versions?",
 )
 def test_single_func():
@@ -33,7 +33,7 @@ def test_single_func():
 
 
 @pytest.mark.skipif(
-    sys.version_info != (3, 9),
+    sys.version_info[:2] != (3, 9),
     reason="The number of nodes visitied varies between python versions?",
 )
 def test_nested_func():
@@ -67,7 +67,7 @@ def test_nested_func():
 
 
 @pytest.mark.skipif(
-    sys.version_info != (3, 9),
+    sys.version_info[:2] != (3, 9),
     reason="The number of nodes visitied varies between python versions?",
 )
 def test_continues():
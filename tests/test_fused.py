@@ -0,0 +1,85 @@
+import ast
+from http.client import HTTPConnection
+from typing import Any
+
+from deep_ast import DeepVisitor, Diagnostics, FusedVisitor
+from tests.test_http_client import ParseExceptions
+
+
+class CountCalls(DeepVisitor):
+    def __init__(self) -> None:
+        self.calls_by_name = {}
+        super().__init__()
+
+    def visit_Call(self, node: ast.Call) -> Any:
+        if isinstance(node.func, ast.Name):
+            name = node.func.id
+            self.calls_by_name[name] = self.calls_by_name.get(name, 0) + 1
+
+        return self.generic_visit(node)
+
+
+class RaisePaths(DeepVisitor):
+    def __init__(self) -> None:
+        self.paths = []
+        super().__init__()
+
+    def visit_Raise(self, node: ast.Raise) -> Any:
+        self.paths.append(tuple(self.call_path()))
+        return self.generic_visit(node)
+
+
+def _run_alone(visitor: DeepVisitor) -> DeepVisitor:
+    visitor.deep_visit(HTTPConnection.getresponse)
+    return visitor
+
+
+def test_matches_separate_visitors():
+
+    exceptions, calls, paths = ParseExceptions(), CountCalls(), RaisePaths()
+
+    fused = FusedVisitor([exceptions, calls, paths])
+    fused.deep_visit(HTTPConnection.getresponse)
+
+    expected_exceptions = _run_alone(ParseExceptions())
+    expected_calls = _run_alone(CountCalls())
+    expected_paths = _run_alone(RaisePaths())
+
+    assert exceptions.raw_exceptions == expected_exceptions.raw_exceptions
+    assert exceptions.found_exceptions == expected_exceptions.found_exceptions
+    assert calls.calls_by_name == expected_calls.calls_by_name
+    assert paths.paths == expected_paths.paths
+    assert fused.visited_nodes == expected_exceptions.visited_nodes
+    assert fused.parent_nodes == expected_exceptions.parent_nodes
+
+
+def test_expands_once():
+
+    visitors = [ParseExceptions(), ParseExceptions()]
+
+    fused = FusedVisitor(visitors)
+    fused.deep_visit(HTTPConnection.getresponse)
+
+    alone = _run_alone(ParseExceptions())
+
+    assert fused.cache.misses == alone.cache.misses
+    assert fused.visited_nodes == alone.visited_nodes
+    assert visitors[0].raw_exceptions == visitors[1].raw_exceptions
+    assert visitors[0].raw_exceptions is not visitors[1].raw_exceptions
+
+
+def test_keeps_member_state():
+
+    seen = []
+
+    exceptions = ParseExceptions()
+    exceptions.diagnostics = Diagnostics(sink=seen.append)
+    own_calls, own_diagnostics = exceptions.calls, exceptions.diagnostics
+
+    fused = FusedVisitor([exceptions, CountCalls()])
+    fused.deep_visit(HTTPConnection.getresponse)
+
+    assert exceptions.calls is own_calls
+    assert exceptions.diagnostics is own_diagnostics
+    assert exceptions.diagnostics.records() == fused.diagnostics.records()
+    assert len(seen) == len(fused.diagnostics) > 0
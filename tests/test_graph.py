@@ -0,0 +1,51 @@
+from deep_ast import build_call_graph
+from tests.examples.functions import func_b, func_d, func_e, func_f, func_g
+
+
+def test_csr():
+
+    graph = build_call_graph([func_d, func_b])
+
+    assert graph.names == ["func_d()", "func_a()", "func_c()", "func_b()"]
+    assert list(graph.indptr) == [0, 2, 2, 2, 3]
+    assert list(graph.indices) == [1, 2, 1]
+    assert graph.entry_points == [0, 3]
+
+
+def test_shared_callables_are_expanded_once():
+
+    graph = build_call_graph([func_d, func_b, func_f])
+
+    assert graph.names.count("func_a()") == 1
+
+
+def test_reachability():
+
+    graph = build_call_graph([func_d, func_b, func_f])
+
+    assert graph.entry_points_reaching("func_a()") == [
+        "func_d()",
+        "func_b()",
+        "func_f()",
+    ]
+    assert graph.entry_points_reaching("func_c()") == ["func_d()"]
+    assert graph.reverse_reach(graph.ids("func_c()")) == set(graph.ids("func_c()")) | {
+        0
+    }
+
+
+def test_node_tags():
+
+    graph = build_call_graph([func_d, func_b, func_f, func_e])
+
+    assert graph.entry_points_with("Raise ValueError") == ["func_f()", "func_e()"]
+    assert graph.entry_points_with("Raise") == ["func_f()", "func_e()"]
+    assert graph.entry_points_with("Raise KeyError") == []
+
+
+def test_recursion():
+
+    graph = build_call_graph([func_g])
+
+    assert graph.names == ["func_g()"]
+    assert list(graph.indices) == [0]
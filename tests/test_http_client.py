@@ -8,10 +8,10 @@ from deep_ast import DeepVisitor
 
 
 class ParseExceptions(DeepVisitor):
-    def __init__(self) -> None:
+    def __init__(self, **kwargs) -> None:
         self.raw_exceptions = []
         self.found_exceptions = []
-        super().__init__()
+        super().__init__(**kwargs)
 
     def _add_exception(self, name: str):
         self.raw_exceptions.append(name)
@@ -42,7 +42,7 @@ class ParseExceptions(DeepVisitor):
 
 
 @pytest.mark.skipif(
-    sys.version_info != (3, 9),
+    sys.version_info[:2] != (3, 9),
     reason="The number of nodes visitied varies between python versions?",
 )
 def test_exceptions():
@@ -51,8 +51,8 @@ def test_exceptions():
 
     parser.deep_visit(HTTPConnection.getresponse)
 
-    assert parser.visited_nodes == 24489
-    assert len(parser.raw_exceptions) == 181
+    assert parser.visited_nodes == 7029
+    assert len(parser.raw_exceptions) == 57
     assert len(parser.found_exceptions) == 8
     assert parser.parent_nodes[0] == "HTTPConnection.getresponse()"
     assert parser.parent_nodes[-1] == "HTTPResponse._close_conn()"
@@ -0,0 +1,245 @@
+import importlib.util
+import subprocess
+import sys
+
+from deep_ast import (
+    ResultStore,
+    changed_between_revisions,
+    changed_between_trees,
+)
+from tests.test_http_client import ParseExceptions
+
+SOURCE = """
+def helper():
+    raise ValueError("a")
+
+
+def other():
+    raise KeyError("b")
+
+
+def entry_a():
+    helper()
+
+
+def entry_b():
+    other()
+"""
+
+CHANGED = SOURCE.replace('KeyError("b")', 'KeyError("c")')
+
+
+def _import(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _analyze(func):
+    parser = ParseExceptions()
+    parser.deep_visit(func)
+    return parser.found_exceptions, parser
+
+
+def _setup(tmp_path, name):
+    old = tmp_path / "old"
+    old.mkdir()
+    (old / "app.py").write_text(SOURCE)
+
+    module = _import(old / "app.py", name)
+
+    return old, [module.entry_a, module.entry_b]
+
+
+def test_first_run(tmp_path):
+
+    root, entry_points = _setup(tmp_path, "incremental_first")
+
+    store = ResultStore(root)
+
+    results = store.update(entry_points, _analyze)
+
+    assert results == {
+        "app.py:entry_a": ["ValueError"],
+        "app.py:entry_b": ["KeyError"],
+    }
+    assert store.reanalyzed == ["app.py:entry_a", "app.py:entry_b"]
+    assert set(store.results["app.py:entry_a"].callables) == {
+        "app.py:entry_a",
+        "app.py:helper",
+    }
+
+
+def test_changed_between_trees(tmp_path):
+
+    root, entry_points = _setup(tmp_path, "incremental_trees")
+
+    store = ResultStore(root)
+    store.update(entry_points, _analyze)
+
+    new = tmp_path / "new"
+    new.mkdir()
+    (new / "app.py").write_text(CHANGED + "\n# A comment isn't a change\n")
+
+    changed = changed_between_trees(root, new)
+
+    assert changed == {"app.py:other"}
+
+    results = store.update(entry_points, _analyze, changed)
+
+    assert store.reanalyzed == ["app.py:entry_b"]
+    assert results["app.py:entry_a"] == ["ValueError"]
+
+
+def test_repeated_definitions(tmp_path):
+
+    source = """
+import sys
+
+if sys.version_info >= (3, 8):
+    def compat():
+        raise ValueError()
+else:
+    def compat():
+        raise KeyError()
+"""
+
+    old, new = tmp_path / "old", tmp_path / "new"
+    old.mkdir()
+    new.mkdir()
+    (old / "app.py").write_text(source)
+    (new / "app.py").write_text(source.replace("ValueError", "TypeError"))
+
+    assert changed_between_trees(old, new) == {"app.py:compat"}
+
+
+def test_source_hashes(tmp_path):
+
+    root, entry_points = _setup(tmp_path, "incremental_hashes")
+
+    store = ResultStore(root)
+    store.update(entry_points, _analyze)
+
+    store.update(entry_points, _analyze)
+    assert store.reanalyzed == []
+
+    (root / "app.py").write_text(CHANGED)
+
+    store.update(entry_points, _analyze)
+    assert store.reanalyzed == ["app.py:entry_b"]
+
+
+def test_unresolved_calls(tmp_path):
+
+    source = """
+def entry():
+    later()
+"""
+
+    root = tmp_path / "old"
+    root.mkdir()
+    (root / "app.py").write_text(source)
+
+    entry = _import(root / "app.py", "incremental_unresolved").entry
+
+    store = ResultStore(root)
+    store.update([entry], _analyze)
+
+    assert store.results["app.py:entry"].unresolved == {"app.py": ["later"]}
+
+    store.update([entry], _analyze)
+    assert store.reanalyzed == []
+
+    added = source + "\n\ndef later():\n    raise OSError()\n"
+
+    new = tmp_path / "new"
+    new.mkdir()
+    (new / "app.py").write_text(added)
+
+    store.update([entry], _analyze, changed_between_trees(root, new))
+    assert store.reanalyzed == ["app.py:entry"]
+
+    (root / "app.py").write_text(added)
+
+    store.update([entry], _analyze)
+    assert store.reanalyzed == ["app.py:entry"]
+
+
+def test_missing_method(tmp_path):
+
+    source = """
+class Svc:
+    def run(self):
+        self.check()
+"""
+
+    root = tmp_path / "old"
+    root.mkdir()
+    (root / "app.py").write_text(source)
+
+    run = _import(root / "app.py", "incremental_missing_method").Svc.run
+
+    store = ResultStore(root)
+    assert store.update([run], _analyze) == {"app.py:Svc.run": []}
+    store.save(tmp_path / "store.json")
+
+    (root / "app.py").write_text(
+        source + "\n    def check(self):\n        raise ValueError()\n"
+    )
+    run = _import(root / "app.py", "incremental_missing_method").Svc.run
+
+    loaded = ResultStore.load(tmp_path / "store.json", root)
+
+    assert loaded.update([run], _analyze) == {"app.py:Svc.run": ["ValueError"]}
+    assert loaded.reanalyzed == ["app.py:Svc.run"]
+
+
+def test_save_and_load(tmp_path):
+
+    root, entry_points = _setup(tmp_path, "incremental_save")
+
+    store = ResultStore(root)
+    results = store.update(entry_points, _analyze)
+    store.save(tmp_path / "store.json")
+
+    loaded = ResultStore.load(tmp_path / "store.json", root)
+
+    assert loaded.update(entry_points, _analyze, set()) == results
+    assert loaded.reanalyzed == []
+
+    assert ResultStore.load(tmp_path / "missing.json").results == {}
+
+
+def test_changed_between_revisions(tmp_path):
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+            + list(args),
+            cwd=tmp_path,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+    git("init", "-q")
+    (tmp_path / "app.py").write_text(SOURCE)
+    (tmp_path / "notes.txt").write_text("notes")
+    git("add", ".")
+    git("commit", "-q", "-m", "first")
+
+    (tmp_path / "app.py").write_text(CHANGED + "\n\ndef added():\n    pass\n")
+    (tmp_path / "notes.txt").write_text("more notes")
+
+    assert changed_between_revisions("HEAD", repository=tmp_path) == {
+        "app.py:other",
+        "app.py:added",
+    }
+
+    git("commit", "-q", "-am", "second")
+
+    assert changed_between_revisions("HEAD~1", "HEAD", tmp_path) == {
+        "app.py:other",
+        "app.py:added",
+    }
@@ -0,0 +1,63 @@
+import ast
+from typing import Any
+
+from deep_ast import DeepVisitor
+from tests.examples.classes import Foo
+from tests.examples.functions import func_a, func_d
+
+
+class RecordPaths(DeepVisitor):
+    def __init__(self) -> None:
+        self.paths = {}
+        super().__init__()
+
+    def visit_Constant(self, node: ast.Constant) -> Any:
+        self.paths[node.value] = self.call_path()
+
+
+def test_call_tree():
+
+    v = DeepVisitor()
+
+    v.deep_visit(func_d)
+
+    parents, callables, lines, _, names = v.calls.to_arrays()
+
+    assert list(parents) == [-1, 0, 0]
+    assert [names[c] for c in callables] == ["func_d()", "func_a()", "func_c()"]
+    assert list(lines) == [0, 2, 3]
+
+
+def test_callables_are_interned():
+
+    v = DeepVisitor()
+
+    v.deep_visit(func_a)
+    v.deep_visit(func_a)
+
+    assert v.parent_nodes == ["func_a()", "func_a()"]
+    assert v.calls.names == ["func_a()"]
+    assert list(v.calls.parents) == [-1, -1]
+
+
+def test_call_path():
+
+    v = RecordPaths()
+
+    v.deep_visit(func_d)
+
+    assert v.paths == {"foo": ["func_d()", "func_a()"], "bar": ["func_d()", "func_c()"]}
+
+
+def test_node_calls():
+
+    v = DeepVisitor()
+
+    v.deep_visit(Foo().method_b)
+
+    assert len(v.node_calls) == v.visited_nodes
+    assert v.call_path(v.node_calls[0]) == ["Foo.method_b()"]
+    assert v.call_path(v.node_calls[-1]) == ["Foo.method_b()"]
+    assert ["Foo.method_b()", "Foo.method_a()"] in [
+        v.call_path(call) for call in v.node_calls
+    ]
@@ -0,0 +1,120 @@
+from deep_ast import RaisesAnalyzer, find_raises
+from tests.examples.raises import (
+    CustomError,
+    catch_exception,
+    catch_exception_or_exit,
+    catch_parent,
+    catch_value,
+    handle_key,
+    handle_os,
+    log_and_reraise,
+    nested_function,
+    ping,
+    pong,
+    raise_value,
+    recursive,
+    reraise,
+    reraise_all,
+    wrap,
+)
+
+
+def _names(callable):
+    return [exception.name for exception in find_raises(callable)]
+
+
+def test_raise():
+
+    (exception,) = find_raises(raise_value)
+
+    assert exception.name == "ValueError"
+    assert exception.exception is ValueError
+    assert exception.path == ("raise_value()",)
+
+
+def test_caught():
+
+    assert _names(catch_value) == []
+
+
+def test_caught_by_parent_class():
+
+    found = find_raises(catch_parent)
+
+    assert [exception.name for exception in found] == ["KeyError"]
+    assert found[0].path == ("catch_parent()", "raise_key()")
+
+
+def test_exception_is_not_catch_all():
+
+    assert _names(catch_exception) == ["SystemExit"]
+    assert _names(catch_exception_or_exit) == []
+
+
+def test_reraise():
+
+    found = {exception.name: exception for exception in find_raises(reraise)}
+
+    assert list(found) == ["OSError", "KeyError"]
+    assert found["KeyError"].path == ("reraise()", "raise_key()")
+
+
+def test_bare_except_reraise():
+
+    assert _names(reraise_all) == ["ValueError", "KeyError"]
+
+
+def test_reraise_in_callee():
+
+    analyzer = RaisesAnalyzer()
+
+    assert [exception.name for exception in analyzer.analyze(handle_key)] == [
+        "KeyError"
+    ]
+    assert [exception.name for exception in analyzer.analyze(handle_os)] == ["OSError"]
+    assert [exception.name for exception in analyzer.analyze(log_and_reraise)] == [
+        "EmptyRaise"
+    ]
+
+
+def test_raise_from_handler():
+
+    assert _names(wrap) == ["RuntimeError"]
+
+
+def test_nested_functions_are_skipped():
+
+    assert _names(nested_function) == []
+
+
+def test_recursion():
+
+    assert _names(recursive) == ["ValueError"]
+
+
+def test_mutual_recursion():
+
+    analyzer = RaisesAnalyzer()
+
+    assert [exception.name for exception in analyzer.analyze(ping)] == ["ValueError"]
+    assert [exception.name for exception in analyzer.analyze(pong)] == ["ValueError"]
+
+
+def test_results_are_reused():
+
+    analyzer = RaisesAnalyzer()
+
+    analyzer.analyze(catch_parent)
+    misses = analyzer.cache.misses
+
+    found = analyzer.analyze(reraise)
+
+    assert [exception.name for exception in found] == ["OSError", "KeyError"]
+    # raise_key() was already analyzed for catch_parent()
+    assert analyzer.cache.misses == misses + 2
+    assert (
+        analyzer.results[analyzer.calls.names.index("raise_custom()")][
+            "CustomError"
+        ].exception
+        is CustomError
+    )
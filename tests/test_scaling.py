@@ -0,0 +1,18 @@
+from benchmarks.scaling import format_table, measure, sweep
+from benchmarks.synthetic import Shape
+
+
+def test_measure():
+
+    result = measure(Shape(functions=4, depth=2, fanout=1), repeat=1)
+
+    assert result["visited_nodes"] > 0
+    assert result["expansions"] > 4
+
+
+def test_sweep():
+
+    rows = sweep("functions", [4, 8], Shape(depth=2, fanout=1), repeat=1)
+
+    assert rows[0]["visited_nodes"] < rows[1]["visited_nodes"]
+    assert format_table("functions", rows).count("\n") == 3
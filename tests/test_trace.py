@@ -0,0 +1,67 @@
+from deep_ast import CallTrace, DeepVisitor, TraceRecorder, record_trace
+from tests.examples.dispatch import Square, describe, run_step, total_area
+
+
+def _expanded(func, trace=None):
+    v = DeepVisitor(trace=trace)
+    v.deep_visit(func)
+    return v
+
+
+def test_static_resolution():
+
+    # The local `step` is resolved by name to an unrelated method.
+    assert _expanded(run_step).parent_nodes == [
+        "run_step()",
+        "pick_step()",
+        "Pipeline.step()",
+    ]
+
+    # The type of `shape` can't be inferred.
+    assert _expanded(total_area).parent_nodes == ["total_area()"]
+
+
+def test_traced_resolution():
+
+    trace = record_trace(run_step)
+
+    v = _expanded(run_step, trace)
+
+    assert v.parent_nodes == ["run_step()", "pick_step()", "double()"]
+    assert v.traced_calls == 2
+
+
+def test_dynamic_dispatch():
+
+    trace = record_trace(total_area, [Square(2)])
+
+    assert _expanded(total_area, trace).parent_nodes == [
+        "total_area()",
+        "Square.area()",
+    ]
+
+
+def test_untraced_calls_are_resolved_statically():
+
+    with TraceRecorder() as recorder:
+        describe([])
+
+    v = _expanded(run_step, recorder.trace)
+
+    assert v.parent_nodes == _expanded(run_step).parent_nodes
+    assert v.traced_calls == 0
+
+
+def test_to_bytes():
+
+    trace = record_trace(total_area, [Square(2)])
+
+    loaded = CallTrace.from_bytes(trace.to_bytes())
+
+    assert loaded.locations == trace.locations
+    assert list(loaded.callees) == list(trace.callees)
+    assert len(loaded) == len(trace)
+    assert (
+        _expanded(total_area, loaded).parent_nodes
+        == _expanded(total_area, trace).parent_nodes
+    )
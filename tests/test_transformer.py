@@ -0,0 +1,119 @@
+import ast
+import inspect
+import sys
+
+import pytest
+
+from deep_ast import DeepTransformer, DeepVisitor, ParseCache
+from tests.examples import functions
+from tests.examples.functions import func_a, func_b
+
+
+class RenamePrint(DeepTransformer):
+    def visit_Name(self, node: ast.Name):
+        if node.id == "print":
+            return ast.copy_location(ast.Name(id="log", ctx=node.ctx), node)
+
+        return node
+
+
+class RemoveExpressions(DeepTransformer):
+    def visit_Expr(self, node: ast.Expr):
+        return None
+
+
+class Untouched(DeepTransformer):
+    pass
+
+
+class DoNothing(DeepTransformer):
+    def visit_Name(self, node: ast.Name):
+        return self.generic_visit(node)
+
+
+def test_shared_cache_is_not_modified():
+
+    cache = ParseCache()
+
+    v = DeepVisitor(cache=cache)
+    v.deep_visit(func_b)
+
+    before = {key: ast.dump(tree) for key, tree in cache._trees.items()}
+
+    t = RenamePrint(cache=cache)
+    t.deep_visit(func_b)
+
+    after = {key: ast.dump(tree) for key, tree in cache._trees.items()}
+
+    assert before == after
+    assert cache.hits == 2
+    assert cache.misses == 2
+
+
+def test_unchanged_nodes_are_shared():
+
+    cache = ParseCache()
+
+    t = DoNothing(cache=cache)
+
+    tree = cache.parse(func_a, t._get_source)
+
+    assert t.visit(tree) is tree
+    assert t.transformed_sources.files == {}
+
+
+def test_changed_nodes_are_copied():
+
+    t = RenamePrint()
+
+    tree = t.cache.parse(func_a, t._get_source)
+    original_body = tree.body[0].body[0]
+
+    new_tree = t.visit(tree)
+
+    assert new_tree is not tree
+    assert tree.body[0].body[0] is original_body
+    assert new_tree.body[0].args is tree.body[0].args
+
+
+def test_nodes_without_visitor_are_not_copied():
+
+    t = Untouched()
+
+    tree = t.cache.parse(func_b, t._get_source)
+    nodes = [id(node) for node in ast.walk(tree)]
+
+    assert t.visit(tree) is tree
+    assert [id(node) for node in ast.walk(tree)] == nodes
+
+
+def test_removed_nodes():
+
+    t = RemoveExpressions()
+
+    tree = t.cache.parse(func_a, t._get_source)
+
+    new_tree = t.visit(tree)
+
+    assert new_tree.body[0].body == []
+    assert len(tree.body[0].body) == 1
+    assert new_tree.body[0].args is tree.body[0].args
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 9),
+    reason="ast.unparse was added in python 3.9",
+)
+def test_transformed_sources():
+
+    t = RenamePrint()
+
+    t.deep_visit(func_b)
+
+    filename = inspect.getsourcefile(functions)
+
+    sources = t.transformed_sources.unparse()
+
+    assert list(sources) == [filename]
+    assert "def func_a():\n    log('foo')\n" in sources[filename]
+    assert 'def func_c():\n    print("bar")\n' in sources[filename]